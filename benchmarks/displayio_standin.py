@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`displayio_standin`
+================================================================================
+A minimal stand-in for the displayio module used to benchmark PaletteSlice on
+CPython without CircuitPython hardware or Blinka. Only the parts of
+displayio.Palette and displayio.Bitmap that PaletteSlice uses are provided.
+
+* Author(s): JG
+"""
+
+from array import array
+
+
+class Palette:
+    """A stand-in for displayio.Palette with packed color and transparency storage."""
+
+    def __init__(self, color_count, *, dither=False):
+        self._colors = array("L", (0 for _ in range(color_count)))
+        self._transparent = bytearray(color_count)
+        self.dither = dither
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(value, (tuple, list, bytes, bytearray)):
+            # An (R, G, B) sequence
+            value = value[0] << 16 | value[1] << 8 | value[2]
+        self._colors[index] = int(value) & 0xFFFFFF
+
+    def make_transparent(self, index):
+        """Set a palette index to transparency."""
+        self._transparent[index] = 1
+
+    def make_opaque(self, index):
+        """Set a palette index to opaque."""
+        self._transparent[index] = 0
+
+    def is_transparent(self, index):
+        """Returns True if the palette index is transparent."""
+        return bool(self._transparent[index])
+
+
+class Bitmap:
+    """A stand-in for displayio.Bitmap with one byte or word per pixel."""
+
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.bits_per_value = 8 if value_count <= 256 else 16
+        typecode = "B" if self.bits_per_value == 8 else "H"
+        self._values = array(typecode, (0 for _ in range(width * height)))
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            index = index[1] * self.width + index[0]
+        self._values[index] = value
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`import_memory`
+================================================================================
+Measures the heap allocated by importing each PaletteSlice entry point on
+CPython. Each entry point is imported in a fresh interpreter and measured with
+tracemalloc; the displayio module and the cedargrove_paletteslice namespace
+package are imported before measuring so that only the PaletteSlice modules are
+counted. The package is compiled to bytecode first, so the compiler is not
+counted either. NumPy is blocked, as ulab is part of the CircuitPython
+firmware rather than the heap. CPython sizes are larger than CircuitPython
+sizes but show the relative cost of each entry point. Use
+``examples/paletteslice_memory_test.py`` to measure free heap on a board.
+
+Usage is ``python benchmarks/import_memory.py [--output results.json]``.
+
+* Author(s): JG
+"""
+
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point name and the statements that load it
+ENTRY_POINTS = (
+    ("paletteslice", "from cedargrove_paletteslice.paletteslice import PaletteSlice"),
+    (
+        "paletteslice+listops",
+        "from cedargrove_paletteslice.paletteslice import PaletteSlice\n"
+        "PaletteSlice.load_extensions('paletteslice_listops')",
+    ),
+    (
+        "paletteslice_acme",
+        "from cedargrove_paletteslice.paletteslice_acme import PaletteSlice",
+    ),
+)
+
+MEASURE = """
+import sys
+import tracemalloc
+sys.path[:0] = [{root!r}, {benchmarks!r}]
+try:
+    import displayio
+except ImportError:
+    import displayio_standin
+    sys.modules["displayio"] = displayio_standin
+# ulab is built into CircuitPython firmware; keep NumPy out of the measurement
+sys.modules["numpy"] = None
+import array, time
+# Warm the path finder caches and import the namespace package so that only
+# the PaletteSlice modules are counted
+import cedargrove_paletteslice
+tracemalloc.start()
+{statements}
+print(tracemalloc.get_traced_memory()[0])
+"""
+
+
+def measure(statements):
+    """Returns the number of bytes allocated by the statements in a fresh
+    interpreter."""
+    code = MEASURE.format(
+        root=ROOT,
+        benchmarks=os.path.join(ROOT, "benchmarks"),
+        statements=statements,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return int(output.stdout)
+
+
+def main():
+    """Measure each entry point and write the JSON results."""
+    parser = argparse.ArgumentParser(description="PaletteSlice import heap cost")
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    args = parser.parse_args()
+
+    # Load the modules from bytecode, as a board loads .mpy files, rather than
+    # counting the compiler
+    compileall.compile_dir(os.path.join(ROOT, "cedargrove_paletteslice"), quiet=1)
+
+    report = {
+        "python": sys.implementation.name + " " + sys.version.split()[0],
+        "results": [
+            {"entry_point": name, "bytes": measure(statements)}
+            for name, statements in ENTRY_POINTS
+        ],
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_benchmark`
+================================================================================
+A CPython benchmark of PaletteSlice construction, slicing, slice assignment,
+transparency, and the paletteslice_acme list methods across a range of palette
+sizes. Blinka's displayio is used if it is installed; otherwise a local
+displayio.Palette stand-in is used. Each module is timed in its own interpreter, so the core cases
+run without the acme extensions loaded. Results are written as JSON so that
+releases can be compared.
+
+Usage is ``python benchmarks/paletteslice_benchmark.py [--sizes 2,256] [--output results.json]``.
+
+* Author(s): JG
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import displayio
+
+    BACKEND = "displayio"
+except ImportError:
+    import displayio_standin as displayio
+
+    # PaletteSlice imports displayio by name
+    sys.modules["displayio"] = displayio
+    BACKEND = "displayio_standin"
+
+# pylint: disable=wrong-import-position
+from cedargrove_paletteslice import paletteslice
+
+SIZES = (2, 16, 256, 4096, 65536)
+# The approximate number of palette entries touched by the calls of each case
+WORK = 1 << 18
+
+
+def make_palette(size):
+    """Returns a displayio.Palette of size opaque colors with every eighth entry
+    transparent."""
+    palette = displayio.Palette(size)
+    for idx in range(size):
+        palette[idx] = (idx * 0x010203) & 0xFFFFFF
+        if idx % 8 == 7:
+            palette.make_transparent(idx)
+    return palette
+
+
+def measure(call, calls, setup=None):
+    """Returns the minimum and mean duration in microseconds of calls to call.
+    The optional setup function is called, untimed, before each call."""
+    durations = []
+    for _ in range(calls):
+        if setup is not None:
+            setup()
+        start = time.perf_counter_ns()
+        call()
+        durations.append(time.perf_counter_ns() - start)
+    return min(durations) / 1000, sum(durations) / len(durations) / 1000
+
+
+def core_cases(source, size):
+    """Returns (case, call, setup) tuples for the core paletteslice methods."""
+    cls = paletteslice.PaletteSlice
+    uncached = cls(source, cache_size=0)
+    cached = cls(source)
+    target = cls(source)
+    patched = cls(source, in_place=True)
+    colors = [(idx * 0x030201) & 0xFFFFFF for idx in range(size)]
+    packed = array("L", colors)
+    palette = make_palette(size)
+
+    def store_list():
+        target[:] = colors
+
+    def store_palette():
+        target[:] = palette
+
+    def store_array():
+        target[:] = packed
+
+    def store_entry():
+        target[size // 2 : size // 2 + 1] = [0x123456]
+
+    def store_entry_palette():
+        target[size // 2 : size // 2 + 1] = [0x123456]
+        return target.palette
+
+    return [
+        ("construct", lambda: cls(source), None),
+        ("construct_in_place", lambda: cls(source, in_place=True), None),
+        ("getitem", lambda: uncached[:], None),
+        ("getitem_step", lambda: uncached[::2], None),
+        ("getitem_step_cached", lambda: cached[::2], lambda: cached[::2]),
+        ("setitem_list", store_list, None),
+        ("setitem_palette", store_palette, None),
+        ("setitem_array", store_array, None),
+        ("set_colors", lambda: target.set_colors(slice(None), packed), None),
+        ("setitem_entry", store_entry, None),
+        ("setitem_entry_palette", store_entry_palette, None),
+        (
+            "make_transparent",
+            lambda: target.make_transparent(size // 2),
+            lambda: target.make_opaque(size // 2),
+        ),
+        (
+            "make_opaque",
+            lambda: target.make_opaque(size // 2),
+            lambda: target.make_transparent(size // 2),
+        ),
+        (
+            "make_transparent_in_place",
+            lambda: patched.make_transparent(size // 2),
+            lambda: patched.make_opaque(size // 2),
+        ),
+        ("is_transparent", lambda: target.is_transparent(size // 2), None),
+    ]
+
+
+def acme_cases(source, size):
+    """Returns (case, call, setup) tuples for the paletteslice_acme list
+    methods. Each call is preceded by an untimed setup that restores the original
+    length, or the original contents for methods that reorder or drop entries,
+    and builds the color index."""
+    # pylint: disable=import-outside-toplevel
+    from cedargrove_paletteslice.paletteslice_acme import PaletteSlice as cls
+
+    acme = cls(source)
+    last = acme.reference_list[-1][0]
+    extension = [(0x102030, False), (0x405060, False), (0x708090, True)]
+
+    def restore():
+        if len(acme) != size:
+            acme[:] = source
+        # Build the color index outside of the timed call
+        acme.count(last)
+
+    def reset():
+        acme[:] = source
+        acme.count(last)
+
+    return [
+        ("append", lambda: acme.append(0x123456), restore),
+        ("extend", lambda: acme.extend(extension), restore),
+        ("insert", lambda: acme.insert(0, 0x123456), restore),
+        ("pop", lambda: acme.pop(0), restore),
+        ("count", lambda: acme.count(last), restore),
+        ("index", lambda: acme.index(last), restore),
+        ("contains", lambda: last in acme, restore),
+        ("remove", lambda: acme.remove(last), restore),
+        ("reverse", acme.reverse, reset),
+        ("sort", acme.sort, reset),
+        ("min", acme.min, None),
+        ("max", acme.max, None),
+        ("all", acme.all, None),
+        ("any", acme.any, None),
+        ("compact", acme.compact, reset),
+    ]
+
+
+# The cases of each module
+SUITES = {"paletteslice": core_cases, "paletteslice_acme": acme_cases}
+
+
+def run(module, sizes, repeat):
+    """Returns the list of benchmark results of a module for each palette size."""
+    results = []
+    for size in sizes:
+        source = make_palette(size)
+        calls = max(repeat, min(1000, WORK // size))
+        for case, call, setup in SUITES[module](source, size):
+            minimum, mean = measure(call, calls, setup)
+            results.append(
+                {
+                    "module": module,
+                    "case": case,
+                    "size": size,
+                    "calls": calls,
+                    "min_us": round(minimum, 3),
+                    "mean_us": round(mean, 3),
+                }
+            )
+    return results
+
+
+def main():
+    """Run the benchmark and write the JSON results."""
+    parser = argparse.ArgumentParser(description="PaletteSlice CPython benchmark")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in SIZES),
+        help="comma-separated palette sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="minimum number of calls per case (default: %(default)s)",
+    )
+    parser.add_argument("--output", help="JSON output file (default: stdout)")
+    parser.add_argument(
+        "--module",
+        choices=sorted(SUITES),
+        help="time one module in this interpreter and write its result list",
+    )
+    args = parser.parse_args()
+
+    if args.module:
+        sizes = [int(size) for size in args.sizes.split(",")]
+        json.dump(run(args.module, sizes, args.repeat), sys.stdout)
+        return
+
+    results = []
+    for module in SUITES:
+        # Time each module in a fresh interpreter so that the core cases run
+        # without the extensions loaded by paletteslice_acme
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--module", module]
+            + ["--sizes", args.sizes, "--repeat", str(args.repeat)],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        results.extend(json.loads(output.stdout))
+
+    report = {
+        "version": paletteslice.__version__,
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "backend": BACKEND,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteanimator`
+================================================================================
+PaletteAnimator runs many PaletteSlice animations, such as color cycles, fades,
+and hue shifts, from a single asyncio task at a fixed frame rate. The changes of
+all animations of a PaletteSlice object within a frame are batched into one
+palette update. Animation work is limited to a time budget per frame; lower
+priority animations are skipped when the budget is used up, and frames that
+overrun the frame period are dropped and counted. The task awaits between
+frames, so sensor, network, and other tasks keep running.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Adafruit CircuitPython asyncio library:
+  https://github.com/adafruit/Adafruit_CircuitPython_asyncio
+
+"""
+
+import time
+import asyncio
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+class PaletteAnimator:
+    """A frame scheduler for PaletteSlice animations that runs as an asyncio task."""
+
+    def __init__(self, fps=30, budget=0.5):
+        """Instantiate the animation scheduler.
+
+        param float fps: The frame rate in frames per second. Defaults to 30.
+        param float budget: The fraction of the frame period that animations may
+        use. When it is used up, the remaining lower priority animations are
+        skipped for that frame; an animation is not skipped in two frames in a
+        row. Defaults to 0.5."""
+        self._period = int(1_000_000_000 / fps)
+        self._budget = int(self._period * budget)
+        self._running = False
+
+        # Animations in descending priority order; each is a list of priority,
+        # PaletteSlice object, target palette, animation function and a flag that
+        # is set if it was skipped in the last frame
+        self._animations = []
+
+        # The PaletteSlice objects and target palettes of the animations; each is
+        # a list of PaletteSlice object, target palette and the PaletteSlice
+        # version when the target was last updated
+        self._targets = []
+
+        self._frames = 0
+        self._dropped = 0
+        self._skipped = 0
+
+    @property
+    def frames(self):
+        """The number of frames run."""
+        return self._frames
+
+    @property
+    def dropped(self):
+        """The number of frames dropped because a frame overran the frame period."""
+        return self._dropped
+
+    @property
+    def skipped(self):
+        """The number of animation steps skipped to stay within the time budget."""
+        return self._skipped
+
+    def add(self, palette_slice, animation, target_palette=None, priority=0):
+        """Add an animation of a PaletteSlice object. Each frame the animation is
+        called as ``animation(frame)`` with the frame number, which counts dropped
+        frames, and modifies the PaletteSlice contents. It is removed when it
+        returns True. After all animations of a frame have run, the displayed
+        palette is updated once: target_palette is updated with
+        ``PaletteSlice.sync_to()`` if the PaletteSlice contents changed since its
+        last update, or, without a target, the class palette of an in-place
+        PaletteSlice object is patched. Returns the animation.
+        Usage is ``PaletteAnimator.add(palette_slice, animation, target_palette, priority)``.
+
+        param PaletteSlice palette_slice: The PaletteSlice object modified by the
+        animation.
+        param function animation: The function called each frame.
+        param displayio.Palette target_palette: The displayed palette to update.
+        Defaults to None, the in-place class palette.
+        param int priority: Higher priority animations run first and are the last
+        to be skipped. Defaults to 0."""
+        entry = [priority, palette_slice, target_palette, animation, False]
+        idx = 0
+        while idx < len(self._animations) and self._animations[idx][0] >= priority:
+            idx += 1
+        self._animations.insert(idx, entry)
+        self._update_targets()
+        return animation
+
+    def remove(self, animation):
+        """Remove an animation. Usage is ``PaletteAnimator.remove(animation)``.
+
+        param function animation: The animation function to remove."""
+        self._animations = [
+            entry for entry in self._animations if entry[3] is not animation
+        ]
+        self._update_targets()
+
+    def step(self, frame):
+        """Run one frame: call the animations in priority order, skipping those that
+        ran in the last frame once the time budget is used up, then update each
+        changed palette once. Returns the number of animations skipped.
+        Usage is ``PaletteAnimator.step(frame)``.
+
+        param int frame: The frame number passed to the animations."""
+        palette_slices = []
+        for palette_slice, _, _ in self._targets:
+            if not any(palette_slice is other for other in palette_slices):
+                palette_slices.append(palette_slice)
+        skipped, finished = self._run_batched(
+            palette_slices, frame, time.monotonic_ns()
+        )
+
+        for target in self._targets:
+            palette_slice, target_palette, version = target
+            if target_palette is not None and palette_slice.version != version:
+                palette_slice.sync_to(target_palette)
+                target[2] = palette_slice.version
+
+        if finished:
+            self._animations = [
+                entry
+                for entry in self._animations
+                if not any(entry is done for done in finished)
+            ]
+            self._update_targets()
+        self._frames += 1
+        self._skipped += skipped
+        return skipped
+
+    def _run_batched(self, palette_slices, frame, started):
+        """Open a batch on each PaletteSlice object, then call the animations.
+        Returns the number of animations skipped and the list of finished
+        animation entries."""
+        if palette_slices:
+            with palette_slices[0].batch():
+                return self._run_batched(palette_slices[1:], frame, started)
+
+        skipped = 0
+        finished = []
+        for entry in self._animations:
+            entry[4] = not entry[4] and time.monotonic_ns() - started > self._budget
+            if entry[4]:
+                skipped += 1
+                continue
+            if entry[3](frame):
+                finished.append(entry)
+        return skipped, finished
+
+    def _update_targets(self):
+        """Update the list of PaletteSlice objects and target palettes to match the
+        animations, keeping the last updated versions."""
+        targets = []
+        for _, palette_slice, target_palette, _, _ in self._animations:
+            for target in targets + self._targets:
+                if target[0] is palette_slice and target[1] is target_palette:
+                    break
+            else:
+                target = [palette_slice, target_palette, None]
+            if not any(target is kept for kept in targets):
+                targets.append(target)
+        self._targets = targets
+
+    async def run(self):
+        """Run frames at the frame rate until ``stop()`` is called. Frames that
+        overrun the frame period are dropped so the animations stay on time.
+        Usage is ``asyncio.create_task(PaletteAnimator.run())``."""
+        self._running = True
+        start = time.monotonic_ns()
+        frame = 0
+        while self._running:
+            self.step(frame)
+            now = time.monotonic_ns()
+            next_frame = max(frame + 1, (now - start) // self._period + 1)
+            self._dropped += next_frame - frame - 1
+            frame = next_frame
+            await asyncio.sleep((start + frame * self._period - now) / 1_000_000_000)
+
+    def stop(self):
+        """Stop ``run()`` after the current frame. Usage is ``PaletteAnimator.stop()``."""
+        self._running = False
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteassign`
+================================================================================
+Slice assignment into the PaletteSlice packed reference storage: the colors of
+palettes, lists, and narrays are moved into simple or extended slices, and
+simple slices may change the storage length. Loaded when a PaletteSlice object
+is first assigned to or resized.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+from array import array
+import displayio
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def _reserve(self, key, count):
+    """Prepare the reference storage slice specified by key to receive count new
+    entries. Like a list, a simple slice may change the storage length but an
+    extended slice may not. Returns the range of storage positions to fill and
+    the start and stop of the modified storage positions."""
+    # pylint: disable=protected-access
+    self._unshare()
+    start, stop, step = self._bounds(key)
+    if step == 1:
+        stop = max(start, stop)
+        region = (start, stop)
+        if count != stop - start:
+            # Resize the storage slice; the new entries are opaque and zero
+            region = _splice(
+                self, start, stop, array("L", (0 for _ in range(count))), b""
+            )
+        return range(start, start + count), region
+    positions = range(start, stop, step)
+    if count != len(positions):
+        raise ValueError(
+            f"attempt to assign sequence of size {count} "
+            f"to extended slice of size {len(positions)}"
+        )
+    if not positions:
+        return positions, (start, start)
+    return positions, (min(positions), max(positions) + 1)
+
+
+def _store(self, key, colors, transparency):
+    """Move an array of colors and a parallel sequence of transparency flags into
+    the reference storage slice specified by key. Returns the start and stop of
+    the modified storage positions."""
+    # pylint: disable=protected-access
+    start, stop, step = self._bounds(key)
+    if step == 1:
+        return _splice(self, start, max(start, stop), colors, transparency)
+    positions, region = _reserve(self, key, len(colors))
+    for idx, position in enumerate(positions):
+        self._colors[position] = colors[idx]
+        self._set_transparent(position, transparency[idx])
+    return region
+
+
+def _set_sequence(self, key, value):
+    """Move the colors of a palette, list, or narray into the reference storage
+    slice specified by key."""
+    # pylint: disable=protected-access
+    # Extract color and transparency from new_color palette
+    colors = array("L")
+    transparency = bytearray(len(value))
+    palette_flag = isinstance(value, displayio.Palette)
+    for idx, color in enumerate(value):
+        if not palette_flag:
+            # value is an array or list
+            colors.append(int(color))
+        else:
+            # value is likely a palette
+            colors.append(color)
+            transparency[idx] = value.is_transparent(idx)
+
+    # Move colors and transparency into the specified reference storage slice
+    self._changed(*_store(self, key, colors, transparency))
+
+
+def _splice(self, start, stop, colors, transparency):
+    """Replace the reference storage entries from start to stop with an array of
+    colors and a parallel sequence of transparency flags. The storage length
+    changes when the number of colors differs from the number replaced. Returns
+    the start and stop of the modified storage positions, including positions
+    that are no longer in use."""
+    # pylint: disable=protected-access
+    self._unshare()
+    offset = len(colors) - (stop - start)
+    self._colors[start:stop] = colors
+    if offset:
+        # Shift the transparency bits that follow the replaced entries
+        old_alpha = self._alpha
+        self._alpha = bytearray((len(self._colors) + 7) >> 3)
+        self._alpha[: start >> 3] = old_alpha[: start >> 3]
+        if start & 7:
+            self._alpha[start >> 3] = old_alpha[start >> 3] & ((1 << (start & 7)) - 1)
+        for position in range(start + len(colors), len(self._colors)):
+            old = position - offset
+            if old_alpha[old >> 3] & (1 << (old & 7)):
+                self._alpha[position >> 3] |= 1 << (position & 7)
+    for idx, transparent in enumerate(transparency):
+        self._set_transparent(start + idx, transparent)
+    if offset:
+        return start, len(self._colors) + max(0, -offset)
+    return start, stop
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"_reserve": _reserve, "_set_sequence": _set_sequence, "_splice": _splice}
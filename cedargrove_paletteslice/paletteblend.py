@@ -0,0 +1,213 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteblend`
+================================================================================
+PaletteBlend crossfades between two equal-length PaletteSlice objects, such as
+day and night themes, in a fixed number of frames. Each frame blends every
+channel of the whole palette with 8-bit fixed-point integer math, vectorized
+with ulab or NumPy when available. Frames are either streamed into two
+double-buffered displayio.Palette objects or precomputed so that playback is
+only palette swaps.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Optional: ulab (CircuitPython) or NumPy (CPython) for vectorized blending
+
+"""
+
+from array import array
+import displayio
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None  # pylint: disable=invalid-name
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Blend weights are fixed-point values from 0 to ONE
+ONE = 256
+
+
+class PaletteBlend:
+    """A crossfade engine that blends two PaletteSlice objects into a sequence of
+    displayio.Palette frames."""
+
+    def __init__(self, start, end, frames, precompute=False):
+        """Instantiate the blend engine. The first frame has the start colors and
+        the last frame has the end colors. A blended entry has the transparency of
+        the start palette for the first half of the fade and of the end palette for
+        the second half. Raises ValueError if the palettes differ in length.
+
+        param PaletteSlice start: The PaletteSlice object to fade from.
+        param PaletteSlice end: The PaletteSlice object to fade to.
+        param int frames: The number of frames in the fade, including the start and
+        end frames.
+        param bool precompute: Compute every frame palette up front so that
+        ``frame()`` only returns a stored palette. Uses one palette per frame.
+        Defaults to False, two palettes that are written as frames are requested."""
+        self._start = start
+        self._end = end
+        self._frames = max(1, frames)
+        self._precompute = precompute
+        self._versions = None
+
+        # The (start, end) pairs of red, green and blue channel arrays
+        self._channels = ((bytearray(), bytearray()),) * 3
+        self._alpha = (bytearray(), bytearray())
+        self._transparency = False
+
+        # Stream palettes, or one palette per frame when precomputed
+        self._palettes = []
+        self._front = 0
+        self._shown = None
+        self.refresh()
+
+    def __len__(self):
+        return self._frames
+
+    def __iter__(self):
+        """Yields the fade palettes in order from start to end."""
+        for index in range(self._frames):
+            yield self.frame(index)
+
+    @property
+    def palette(self):
+        """The most recently returned frame palette."""
+        if self._precompute:
+            return self._palettes[self._shown or 0]
+        return self._palettes[self._front]
+
+    def weight(self, index):
+        """Returns the fixed-point blend weight of a frame, from 0 to ONE (256).
+        Usage is ``PaletteBlend.weight(index)``.
+
+        param int index: The frame index."""
+        if self._frames == 1:
+            return ONE
+        index = min(max(index, 0), self._frames - 1)
+        return (index * ONE + ((self._frames - 1) >> 1)) // (self._frames - 1)
+
+    def refresh(self):
+        """Copy the start and end PaletteSlice colors and transparency and rebuild
+        the frame palettes. Called automatically by ``frame()`` when either
+        PaletteSlice has changed. Raises ValueError if the palettes differ in
+        length."""
+        start_list = self._start.reference_list
+        end_list = self._end.reference_list
+        if len(start_list) != len(end_list):
+            raise ValueError("blended palettes must be the same length")
+        self._versions = (self._start.version, self._end.version)
+        self._alpha = (
+            bytearray(transparent for _, transparent in start_list),
+            bytearray(transparent for _, transparent in end_list),
+        )
+        self._transparency = any(self._alpha[0]) or any(self._alpha[1])
+        self._split(
+            array("L", (color for color, _ in start_list)),
+            array("L", (color for color, _ in end_list)),
+        )
+
+        length = len(start_list)
+        count = self._frames if self._precompute else 2
+        self._palettes = [displayio.Palette(length) for _ in range(count)]
+        self._shown = None
+        if self._precompute:
+            for index in range(count):
+                self._write(self._palettes[index], self.weight(index), True)
+        else:
+            for palette in self._palettes:
+                self._write(palette, 0, True)
+
+    def frame(self, index):
+        """Returns the palette of a frame. Streamed frames are written into the back
+        palette, which then becomes the front palette; a palette returned earlier
+        is reused two frames later.
+        Usage is ``tile_grid.pixel_shader = PaletteBlend.frame(index)``.
+
+        param int index: The frame index from 0 (start) to frames - 1 (end)."""
+        if (self._start.version, self._end.version) != self._versions:
+            self.refresh()
+        index = min(max(index, 0), self._frames - 1)
+        if self._precompute:
+            self._shown = index
+            return self._palettes[index]
+        if index == self._shown:
+            return self._palettes[self._front]
+
+        back = self._palettes[self._front ^ 1]
+        self._write(back, self.weight(index), self._transparency)
+        self._front ^= 1
+        self._shown = index
+        return back
+
+    def _split(self, start_colors, end_colors):
+        """Store the red, green and blue channels of the start and end colors as
+        uint16 ulab/NumPy arrays or as byte arrays."""
+        if np is not None and len(start_colors):
+            stride = start_colors.itemsize
+            values = (
+                np.frombuffer(start_colors, dtype=np.uint8),
+                np.frombuffer(end_colors, dtype=np.uint8),
+            )
+            self._channels = tuple(
+                tuple(
+                    np.array(bytes_[offset::stride], dtype=np.uint16)
+                    for bytes_ in values
+                )
+                for offset in (2, 1, 0)
+            )
+        else:
+            self._channels = tuple(
+                (
+                    bytearray(color >> shift & 0xFF for color in start_colors),
+                    bytearray(color >> shift & 0xFF for color in end_colors),
+                )
+                for shift in (16, 8, 0)
+            )
+
+    def _blend(self, weight):
+        """Returns an iterable of the colors blended at weight. Each channel is
+        blended as (start * (ONE - weight) + end * weight) / ONE, rounded."""
+        if not isinstance(self._channels[0][0], bytearray):
+            red, green, blue = (
+                (start * (ONE - weight) + end * weight + (ONE >> 1)) // ONE
+                for start, end in self._channels
+            )
+            # Pack the channels with float math; 24-bit colors are exact even
+            # with single precision floats
+            return (int(color) for color in red * 65536.0 + green * 256.0 + blue)
+        inverse = ONE - weight
+        (red0, red1), (green0, green1), (blue0, blue1) = self._channels
+        return (
+            (red0[idx] * inverse + red1[idx] * weight + 128) >> 8 << 16
+            | (green0[idx] * inverse + green1[idx] * weight + 128) >> 8 << 8
+            | (blue0[idx] * inverse + blue1[idx] * weight + 128) >> 8
+            for idx in range(len(red0))
+        )
+
+    def _write(self, palette, weight, transparency):
+        """Write the colors blended at weight into a palette. Transparency is
+        written only if the transparency flag is set."""
+        for idx, color in enumerate(self._blend(weight)):
+            palette[idx] = color
+        if not transparency:
+            return
+        alpha = self._alpha[0] if weight < ONE >> 1 else self._alpha[1]
+        for idx, transparent in enumerate(alpha):
+            if transparent:
+                palette.make_transparent(idx)
+            else:
+                palette.make_opaque(idx)
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettebuffer`
+================================================================================
+Single-pass copying of typed buffers of RGB888, RGB565, or packed RGB colors
+into PaletteSlice palettes. Loaded when ``set_colors()`` is first used.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def set_colors(self, key, buffer, color_format=None, mask=None):
+    """Copy colors from a typed buffer into a slice of the primary class palette in
+    a single pass. Permanently modifies the reference storage and palette.
+    Installed as a PaletteSlice method.
+    Usage is ``PaletteSlice.set_colors(key, buffer)``.
+
+    The buffer may be an array.array, memoryview, ulab or NumPy narray, or
+    bytes-like object containing 24-bit RGB888 color values, 16-bit RGB565 color
+    values, or packed 3-byte RGB colors (``PaletteSlice.RGB888``,
+    ``PaletteSlice.RGB565``, ``PaletteSlice.RGB``). Each buffer item is one RGB888
+    color unless another format is specified. New colors are opaque unless a
+    parallel transparency mask is provided. Raises ValueError if a packed RGB
+    buffer length is not a multiple of 3.
+
+    param slice key: The target slice object of the primary class palette.
+    param Union(array, memoryview, narray, bytes) buffer: The new colors.
+    param int color_format: The color format of the buffer. Defaults to None,
+    RGB888.
+    param Union(bytes, list, narray) mask: A sequence of transparency values, one
+    per new color; a non-zero value makes the color transparent. Defaults to
+    None, all colors opaque."""
+    # pylint: disable=protected-access
+    if color_format is None:
+        color_format = self.RGB888
+    count = len(buffer)
+    if color_format == self.RGB:
+        if count % 3:
+            raise ValueError("packed RGB buffer length must be a multiple of 3")
+        count //= 3
+
+    positions, region = self._reserve(key, count)
+    _write_buffer(self, positions, buffer, color_format)
+    alpha = self._alpha
+    for idx, position in enumerate(positions):
+        if mask is not None and mask[idx]:
+            alpha[position >> 3] |= 1 << (position & 7)
+        else:
+            alpha[position >> 3] &= ~(1 << (position & 7))
+    self._changed(*region)
+
+
+def _write_buffer(self, positions, buffer, color_format):
+    """Decode the colors of a typed buffer into a range of storage positions."""
+    colors = self._colors  # pylint: disable=protected-access
+    if color_format == self.RGB565:
+        for idx, position in enumerate(positions):
+            color = int(buffer[idx])
+            # Expand the 5-6-5 bit fields to 8 bits by replicating high bits
+            red = (color >> 11) & 0x1F
+            green = (color >> 5) & 0x3F
+            blue = color & 0x1F
+            colors[position] = (
+                ((red << 3 | red >> 2) << 16)
+                | ((green << 2 | green >> 4) << 8)
+                | (blue << 3 | blue >> 2)
+            )
+    elif color_format == self.RGB:
+        for idx, position in enumerate(positions):
+            colors[position] = (
+                int(buffer[3 * idx]) << 16
+                | int(buffer[3 * idx + 1]) << 8
+                | int(buffer[3 * idx + 2])
+            )
+    elif (
+        getattr(buffer, "typecode", None) == "L"
+        and len(positions) > 1
+        and positions[1] - positions[0] == 1
+    ):
+        # Same storage type and contiguous; copy the whole slice at once
+        colors[positions[0] : positions[0] + len(positions)] = buffer
+    else:
+        for idx, position in enumerate(positions):
+            colors[position] = int(buffer[idx])
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"set_colors": set_colors}
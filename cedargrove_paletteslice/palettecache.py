@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettecache`
+================================================================================
+The PaletteSlice slice cache. The most recently used slice palettes are kept so
+that repeating a slice of unchanged contents returns the cached palette instead
+of allocating a new one. Loaded when a PaletteSlice object with a cache is first
+sliced.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def _cached_slice(self, bounds):
+    """Returns the palette for a (start, stop, step) storage bounds tuple from the
+    slice cache, creating and caching the palette if not found. Cache entries
+    made before the current version are discarded."""
+    # pylint: disable=protected-access
+    if self._cache_version != self._version:
+        self._slice_cache = []
+        self._cache_version = self._version
+    for idx, (cached_bounds, new_palette) in enumerate(self._slice_cache):
+        if cached_bounds == bounds:
+            # Move the entry to the most recently used position
+            self._slice_cache.insert(0, self._slice_cache.pop(idx))
+            if self._stats is not None:
+                self._record("hit")
+            return new_palette
+    new_palette = self._slice(bounds)
+    self._slice_cache.insert(0, (bounds, new_palette))
+    del self._slice_cache[self._cache_size :]
+    return new_palette
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"_cached_slice": _cached_slice}
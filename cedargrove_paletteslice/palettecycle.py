@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettecycle`
+================================================================================
+PaletteCycle is a color-cycling engine for PaletteSlice objects. Sub-ranges of
+the palette are rotated each frame to animate waterfalls, gradients, and other
+classic palette effects. Frames are written into two preallocated
+displayio.Palette objects that are swapped each frame, so steady-state animation
+does not allocate memory.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+from array import array
+import displayio
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+class PaletteCycle:
+    """A color-cycling engine that rotates ranges of a PaletteSlice object into a pair
+    of double-buffered displayio.Palette objects."""
+
+    def __init__(self, palette_slice):
+        """Instantiate the color-cycling engine. Creates two displayio.Palette
+        objects with the PaletteSlice colors and transparency.
+
+        param PaletteSlice palette_slice: The source PaletteSlice object."""
+        self._palette_slice = palette_slice
+        self._version = None
+        self._colors = array("L")
+        self._alpha = bytearray()
+        self._palettes = [None, None]
+        self._front = 0
+
+        # Each range is a list of start, stop, speed, phase and a flag that is
+        # set if the range contains transparent entries; speed and phase are
+        # fixed-point values with 8 fractional bits
+        self._ranges = []
+        self.refresh()
+
+    @property
+    def palette(self):
+        """The front displayio.Palette object; the most recently completed frame."""
+        return self._palettes[self._front]
+
+    def add_range(self, start, stop, speed=1):
+        """Add a range of palette entries to rotate. Ranges should not overlap.
+        Usage is ``PaletteCycle.add_range(start, stop, speed)``.
+
+        param int start: The first palette index of the range.
+        param int stop: The palette index following the range.
+        param float speed: The number of entries to rotate each frame. Fractional
+        speeds rotate once every few frames. Positive speeds move colors toward
+        higher indices, negative speeds toward lower indices. Defaults to 1."""
+        start, stop, _ = slice(start, stop).indices(len(self._colors))
+        if stop - start > 1:
+            self._ranges.append(
+                [start, stop, int(speed * 256), 0, any(self._alpha[start:stop])]
+            )
+
+    def clear_ranges(self):
+        """Remove all ranges and restore the unrotated palette colors."""
+        self._ranges = []
+        self.refresh()
+
+    def refresh(self):
+        """Copy the PaletteSlice colors and transparency into both palettes. Called
+        automatically by ``step()`` when the PaletteSlice contents have changed."""
+        reference_list = self._palette_slice.reference_list
+        self._version = self._palette_slice.version
+        self._colors = array("L", (color for color, _ in reference_list))
+        self._alpha = bytearray(transparent for _, transparent in reference_list)
+        length = len(self._colors)
+
+        # Drop or shorten the ranges that no longer fit the palette
+        self._ranges = [cycle for cycle in self._ranges if length - cycle[0] > 1]
+        for cycle in self._ranges:
+            cycle[1] = min(cycle[1], length)
+            cycle[3] %= (cycle[1] - cycle[0]) << 8
+            cycle[4] = any(self._alpha[cycle[0] : cycle[1]])
+
+        for idx in range(2):
+            if self._palettes[idx] is None or len(self._palettes[idx]) != length:
+                self._palettes[idx] = displayio.Palette(length)
+            self._copy(self._palettes[idx], 0, length, 0, True)
+            for cycle in self._ranges:
+                self._copy(self._palettes[idx], cycle[0], cycle[1], cycle[3] >> 8, True)
+
+    def step(self):
+        """Advance all ranges by one frame. The rotated ranges are written into the
+        back palette, which then becomes the front palette. Returns the front
+        palette. The palettes are not swapped if no range moved.
+        Usage is ``tile_grid.pixel_shader = PaletteCycle.step()``."""
+        if self._palette_slice.version != self._version:
+            self.refresh()
+
+        moved = False
+        for cycle in self._ranges:
+            length = cycle[1] - cycle[0]
+            offset = cycle[3] >> 8
+            cycle[3] = (cycle[3] + cycle[2]) % (length << 8)
+            if cycle[3] >> 8 != offset:
+                moved = True
+        if not moved:
+            return self._palettes[self._front]
+
+        back = self._palettes[self._front ^ 1]
+        for cycle in self._ranges:
+            self._copy(back, cycle[0], cycle[1], cycle[3] >> 8, cycle[4])
+        self._front ^= 1
+        return back
+
+    def _copy(self, target, start, stop, offset, transparency):
+        """Write the colors of the range from start to stop into the target palette,
+        rotated toward higher indices by offset entries. Transparency is written
+        only if the transparency flag is set."""
+        length = stop - start
+        for idx in range(length):
+            source = start + (idx - offset) % length
+            target[start + idx] = self._colors[source]
+            if not transparency:
+                continue
+            if self._alpha[source]:
+                target.make_transparent(start + idx)
+            else:
+                target.make_opaque(start + idx)
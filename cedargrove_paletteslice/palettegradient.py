@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettegradient`
+================================================================================
+Multi-stop linear and gamma-corrected color gradients for PaletteSlice palette
+ranges. Gradients are computed with fixed-point integer math, vectorized with
+ulab or NumPy when available. Both paths compute the same colors.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Optional: ulab (CircuitPython) or NumPy (CPython) for vectorized gradients
+
+"""
+
+from array import array
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None  # pylint: disable=invalid-name
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Gradient positions are fixed-point values from 0 to ONE
+ONE = 0x10000
+
+
+def gradient(count, stops, gamma=1.0):
+    """Returns an array of count RGB888 colors that blend through the color stops.
+    Stops are either a list of colors spaced evenly across the gradient or a list
+    of (position, color) tuples with positions from 0.0 to 1.0. Colors are blended
+    in gamma-encoded space: each 8-bit channel is blended as (channel / 255) ** gamma,
+    so a gamma of 1.0 blends the channel values directly and a gamma of 2.2
+    approximates blending in linear light. Returns an array.array, or a ulab/NumPy
+    narray when vectorized.
+
+    param int count: The number of colors in the gradient.
+    param list stops: The list of colors or (position, color) tuples.
+    param float gamma: The channel blending exponent. Defaults to 1.0."""
+    positions, colors = _parse_stops(stops)
+    if np is not None and count > 1 and hasattr(np, "take"):
+        return _vector_gradient(count, positions, colors, gamma)
+    return _integer_gradient(count, positions, colors, gamma)
+
+
+def fill_gradient(self, key, stops, gamma=1.0):
+    """Fill a slice of the primary class palette with a multi-stop color gradient
+    in a single bulk operation. Filled colors are opaque. Permanently modifies
+    the reference storage and palette. Installed as a PaletteSlice method.
+    Usage is ``PaletteSlice.fill_gradient(key, stops, gamma)``.
+
+    param slice key: The target slice object of the primary class palette.
+    param list stops: A list of colors spaced evenly across the slice or a list
+    of (position, color) tuples with positions from 0.0 to 1.0.
+    param float gamma: The channel blending exponent; 1.0 blends channel values
+    linearly. Defaults to 1.0."""
+    count = len(range(*self._bounds(key)))  # pylint: disable=protected-access
+    self.set_colors(key, gradient(count, stops, gamma), self.RGB888)
+
+
+def _integer_gradient(count, positions, colors, gamma):
+    """Returns an array of count RGB888 colors computed with fixed-point math."""
+    decode = _decode_table(gamma)
+    channels = _decode_stops(decode, colors)
+
+    result = array("L")
+    segment = 0
+    last = len(positions) - 1
+    for idx in range(count):
+        position = idx * ONE // (count - 1) if count > 1 else 0
+        # Advance to the last stop at or before the position
+        while segment < last and position > positions[segment + 1]:
+            segment += 1
+        if segment == last or position <= positions[segment]:
+            # On a stop, before the first stop, or after the last stop
+            result.append(colors[segment])
+            continue
+        fraction = (
+            (position - positions[segment])
+            * ONE
+            // (positions[segment + 1] - positions[segment])
+        )
+        color = 0
+        for low, high in zip(channels[segment], channels[segment + 1]):
+            color = color << 8 | _encode(
+                decode, low + (((high - low) * fraction + 0x8000) >> 16)
+            )
+        result.append(color)
+    return result
+
+
+def _decode_table(gamma):
+    """Returns the table of the 16-bit decoded values of the 8-bit channel values."""
+    return array("H", (round(((c / 255) ** gamma) * 0xFFFF) for c in range(256)))
+
+
+def _decode_stops(decode, colors):
+    """Returns a list of the (red, green, blue) decoded channel values of the stop
+    colors."""
+    return [
+        (decode[color >> 16 & 0xFF], decode[color >> 8 & 0xFF], decode[color & 0xFF])
+        for color in colors
+    ]
+
+
+def _parse_stops(stops):
+    """Returns parallel lists of fixed-point stop positions and stop colors, sorted
+    by position."""
+    if not stops:
+        raise ValueError("at least one color stop is required")
+    parsed = []
+    for idx, stop in enumerate(stops):
+        if isinstance(stop, tuple):
+            position, color = stop
+        else:
+            position = idx / (len(stops) - 1) if len(stops) > 1 else 0
+            color = stop
+        parsed.append((int(position * ONE), int(color)))
+    parsed.sort()
+    return [position for position, _ in parsed], [color for _, color in parsed]
+
+
+def _encode(decode, value):
+    """Returns the 8-bit channel value whose decoded value is nearest to value.
+    Uses a binary search of the ascending decode table."""
+    # Find the first channel value with a decoded value at or above value
+    low, high = 0, 255
+    while low < high:
+        middle = (low + high) >> 1
+        if decode[middle] < value:
+            low = middle + 1
+        else:
+            high = middle
+    if low and value - decode[low - 1] < decode[low] - value:
+        return low - 1
+    return low
+
+
+def _vector_gradient(count, positions, colors, gamma):
+    """Returns a narray of count RGB888 colors computed with the fixed-point math
+    of ``_integer_gradient()`` using vectorized operations. Products wider than
+    24 bits are computed in 8-bit steps, so every intermediate value is exact
+    with single precision floats."""
+    decode = _decode_table(gamma)
+    channels = _decode_stops(decode, colors)
+    position = _vector_ratio(np.linspace(0, count - 1, count), count - 1)
+
+    # On or before the first stop, or after the last stop
+    result = (position <= positions[0]) * 1.0 * colors[0]
+    result = result + (position > positions[-1]) * 1.0 * colors[-1]
+
+    blended, fractions, lows, deltas = _vector_segments(position, positions, channels)
+
+    table = np.array(decode)
+    color = np.zeros(count)
+    for channel in range(3):
+        color = color * 256 + _vector_encode(
+            table, _vector_blend(lows[channel], deltas[channel], fractions)
+        )
+    return result + blended * color
+
+
+def _vector_segments(position, positions, channels):
+    """Returns narrays of the segment of each fixed-point position: a 1.0 mask of
+    the interpolated positions, the fractions within their segments, and lists of
+    the decoded start channel values and channel differences of the segments."""
+    count = len(position)
+    blended = np.zeros(count)
+    fractions = np.zeros(count)
+    lows = [np.zeros(count) for _ in range(3)]
+    deltas = [np.zeros(count) for _ in range(3)]
+    for segment in range(len(positions) - 1):
+        start, stop = positions[segment], positions[segment + 1]
+        if start == stop:
+            continue
+        inside = (position > start) * 1.0 * ((position <= stop) * 1.0)
+        blended = blended + inside
+        fractions = fractions + inside * _vector_ratio(position - start, stop - start)
+        for channel in range(3):
+            low = channels[segment][channel]
+            lows[channel] = lows[channel] + inside * low
+            deltas[channel] = deltas[channel] + inside * (
+                channels[segment + 1][channel] - low
+            )
+    return blended, fractions, lows, deltas
+
+
+def _vector_ratio(values, divisor):
+    """Returns floor(values * ONE / divisor) of a narray of integer values of at
+    most ONE, computed in two 8-bit steps."""
+    scaled = values * 256
+    quotients = np.floor(scaled / divisor)
+    remainders = scaled - quotients * divisor
+    return quotients * 256 + np.floor(remainders * 256 / divisor)
+
+
+def _vector_blend(lows, deltas, fractions):
+    """Returns lows + ((deltas * fractions + 0x8000) >> 16) of narrays of 16-bit
+    channel values, channel differences, and fixed-point fractions."""
+    fraction_high = np.floor(fractions / 256)
+    rounded = np.floor((deltas * (fractions - fraction_high * 256) + 0x8000) / 256)
+    product = deltas * fraction_high
+    product_high = np.floor(product / 256)
+    return (
+        lows + product_high + np.floor((product - product_high * 256 + rounded) / 256)
+    )
+
+
+def _vector_encode(table, values):
+    """Returns the 8-bit channel values whose decoded values are nearest to a
+    narray of values; the vectorized form of ``_encode()``."""
+    low = np.zeros(len(values))
+    high = low + 255
+    for _ in range(8):
+        middle = np.floor((low + high) / 2)
+        below = (np.take(table, np.array(middle, dtype=np.uint8)) < values) * 1.0
+        low = low + below * (middle + 1 - low)
+        high = middle + below * (high - middle)
+    current = np.take(table, np.array(low, dtype=np.uint8))
+    previous = np.take(table, np.array(np.maximum(low - 1, 0), dtype=np.uint8))
+    nearer = ((values - previous) < (current - values)) * 1.0 * ((low > 0) * 1.0)
+    return low - nearer
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"fill_gradient": fill_gradient}
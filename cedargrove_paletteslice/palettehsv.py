@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettehsv`
+================================================================================
+Hue rotation and saturation scaling of PaletteSlice palette ranges for palette
+animation. The colors are decomposed into integer hue, saturation, and value
+once; each transform then only recombines the cached decomposition, with integer
+math or, when ulab or NumPy is available, with vectorized array math. Transforms
+are applied to the colors as they were before the first transform, so they do
+not accumulate rounding errors.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Optional: ulab (CircuitPython) or NumPy (CPython) for vectorized transforms
+
+"""
+
+from array import array
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None  # pylint: disable=invalid-name
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Hues are integers from 0 to HUE_RANGE, 256 steps for each of the six sectors
+# of the color wheel
+HUE_RANGE = 1536
+
+# Saturation scales are fixed-point values; ONE leaves saturation unchanged
+ONE = 256
+
+
+def rotate_hue(self, degrees, key=None):
+    """Rotate the hues of a slice of the primary class palette. The rotation
+    replaces the previous rotation rather than adding to it, so an animation
+    passes the total angle of each frame. The saturation scale last set by
+    ``scale_saturation()`` is kept. Transparency is unchanged. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.rotate_hue(degrees, key)``.
+
+    param float degrees: The hue rotation of the original colors in degrees.
+    param slice key: The slice object of the primary class palette to transform.
+    Defaults to None, the whole palette."""
+    hsv = _cached_hsv(self)
+    hsv[5] = int(degrees * HUE_RANGE / 360) % HUE_RANGE
+    _recombine(self, hsv, key)
+
+
+def scale_saturation(self, factor, key=None):
+    """Scale the saturation of a slice of the primary class palette. The scale
+    replaces the previous scale rather than compounding it. The hue rotation last
+    set by ``rotate_hue()`` is kept. Transparency is unchanged. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.scale_saturation(factor, key)``.
+
+    param float factor: The saturation scale of the original colors; 0.0 is gray
+    and 1.0 is unchanged. Saturation is limited to full saturation.
+    param slice key: The slice object of the primary class palette to transform.
+    Defaults to None, the whole palette."""
+    hsv = _cached_hsv(self)
+    hsv[6] = max(0, int(factor * ONE + 0.5))
+    _recombine(self, hsv, key)
+
+
+def _cached_hsv(self):
+    """Returns the HSV cache of a PaletteSlice object: a list of the color version,
+    the original colors, their hue, saturation and value arrays, the hue rotation,
+    and the saturation scale. The cache is rebuilt from the current colors if the
+    palette colors were modified other than by a hue or saturation transform;
+    transparency changes keep it."""
+    # pylint: disable=protected-access
+    if self._hsv is None or self._hsv[0] != self._color_version:
+        original = array("L", self._colors)
+        hues = array("H", (0 for _ in range(len(original))))
+        saturations = bytearray(len(original))
+        values = bytearray(len(original))
+        for position, color in enumerate(original):
+            hues[position], saturations[position], values[position] = _hsv(color)
+        if np is not None and len(original):
+            hues, saturations, values = (
+                np.array(channel) * 1.0 for channel in (hues, saturations, values)
+            )
+        self._hsv = [self._color_version, original, hues, saturations, values, 0, ONE]
+    return self._hsv
+
+
+def _recombine(self, hsv, key):
+    """Write the cached colors of a slice transformed by the hue rotation and
+    saturation scale of the HSV cache into the reference storage."""
+    # pylint: disable=protected-access
+    original, hues, saturations, values, shift, scale = hsv[1:]
+    positions = range(*self._bounds(slice(None) if key is None else key))
+    if not positions:
+        return
+    self._unshare()
+    colors = self._colors
+    if shift == 0 and scale == ONE:
+        for position in positions:
+            colors[position] = original[position]
+    elif isinstance(hues, array):
+        for position in positions:
+            colors[position] = _rgb(
+                (hues[position] + shift) % HUE_RANGE,
+                min(255, saturations[position] * scale >> 8),
+                values[position],
+            )
+    else:
+        packed = _vector_rgb(hues, saturations, values, shift, scale)
+        for position in positions:
+            colors[position] = int(packed[position])
+    self._changed(min(positions), max(positions) + 1)
+    hsv[0] = self._color_version
+
+
+def _hsv(color):
+    """Returns the integer (hue, saturation, value) of an RGB888 color. Hue is
+    from 0 to HUE_RANGE; saturation and value are from 0 to 255."""
+    red = color >> 16 & 0xFF
+    green = color >> 8 & 0xFF
+    blue = color & 0xFF
+    high = max(red, green, blue)
+    chroma = high - min(red, green, blue)
+    if not chroma:
+        return 0, 0, high
+    if high == red:
+        hue = ((green - blue) * 256 + (chroma >> 1)) // chroma
+    elif high == green:
+        hue = 512 + ((blue - red) * 256 + (chroma >> 1)) // chroma
+    else:
+        hue = 1024 + ((red - green) * 256 + (chroma >> 1)) // chroma
+    return hue % HUE_RANGE, (chroma * 255 + (high >> 1)) // high, high
+
+
+def _rgb(hue, saturation, value):
+    """Returns the RGB888 color of an integer hue, saturation, and value."""
+    chroma = (value * saturation + 127) // 255
+    low = value - chroma
+    step = chroma * (hue & 0xFF) >> 8
+    sector = hue >> 8
+    if sector == 0:
+        return value << 16 | (low + step) << 8 | low
+    if sector == 1:
+        return (value - step) << 16 | value << 8 | low
+    if sector == 2:
+        return low << 16 | value << 8 | (low + step)
+    if sector == 3:
+        return low << 16 | (value - step) << 8 | value
+    if sector == 4:
+        return (low + step) << 16 | low << 8 | value
+    return value << 16 | low << 8 | (value - step)
+
+
+def _vector_rgb(hues, saturations, values, shift, scale):
+    """Returns a ulab or NumPy array of the packed RGB888 colors of the cached hue,
+    saturation, and value arrays transformed by a hue rotation and saturation
+    scale. Computes the same colors as ``_rgb()``."""
+    hues = hues + shift
+    hues = hues - (hues >= HUE_RANGE) * HUE_RANGE
+    saturations = np.minimum(np.floor(saturations * scale / ONE), 255)
+    chroma = np.floor((values * saturations + 127) / 255)
+    low = values - chroma
+    sector = np.floor(hues / 256)
+    step = np.floor(chroma * (hues - sector * 256) / 256)
+    rising = low + step
+    falling = values - step
+
+    # Select the channel value of each sector with 0.0 or 1.0 masks
+    masks = [(sector == idx) * 1.0 for idx in range(6)]
+    red = (
+        values * (masks[0] + masks[5])
+        + falling * masks[1]
+        + low * (masks[2] + masks[3])
+        + rising * masks[4]
+    )
+    green = (
+        rising * masks[0]
+        + values * (masks[1] + masks[2])
+        + falling * masks[3]
+        + low * (masks[4] + masks[5])
+    )
+    blue = (
+        low * (masks[0] + masks[1])
+        + rising * masks[2]
+        + values * (masks[3] + masks[4])
+        + falling * masks[5]
+    )
+    return red * 65536 + green * 256 + blue
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"rotate_hue": rotate_hue, "scale_saturation": scale_saturation}
@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteinplace`
+================================================================================
+In-place patching of the PaletteSlice class palette. Modified entries are
+written into the existing class palette, which is only reallocated when its
+reserved capacity is exceeded. Loaded when an in-place PaletteSlice object is
+first modified.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def _capacity(self):
+    """The number of entries reserved in the class palette."""
+    self._flush()  # pylint: disable=protected-access
+    return len(self.palette)
+
+
+def _patch_palette(self, start, stop):
+    """Patch the reference storage positions from start to stop into the in-place
+    class palette, reallocating it with a quarter more room if the reserved
+    capacity is exceeded."""
+    # pylint: disable=protected-access
+    length = len(self._colors)
+    palette = self._new_palette
+    if length > len(palette):
+        self._new_palette = self._create_palette(range(length), length + (length >> 2))
+        if self._stats is not None:
+            self._record("rebuild", length)
+        return
+    for position in range(start, min(stop, length)):
+        palette[position] = self._colors[position]
+        if self._alpha[position >> 3] & (1 << (position & 7)):
+            palette.make_transparent(position)
+        else:
+            palette.make_opaque(position)
+    for position in range(length, min(stop, len(palette))):
+        palette[position] = 0
+        palette.make_transparent(position)
+    if self._stats is not None:
+        self._record("patch", max(0, min(stop, len(palette)) - start))
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"capacity": property(_capacity), "_patch_palette": _patch_palette}
@@ -0,0 +1,255 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteio`
+================================================================================
+Palette file input and output for PaletteSlice. Palettes are saved in a compact
+binary format that is read directly into the packed reference storage, so many
+palettes can be restored at startup without decoding images. Palettes are also
+imported from the header of BMP images and from GIMP (.gpl), Adobe (.act), and
+JASC (.pal) palette files. Imports stream the palette data through a small
+fixed buffer into the reference storage and do not read image pixels.
+
+The file format is a 12-byte header followed by the colors as 32-bit
+little-endian RGB888 values and the transparency bitmask with one bit per
+color, least significant bit first. The header is the magic bytes ``PSLC``, the
+16-bit format version, 16 reserved bits, and the 32-bit number of colors, all
+little-endian.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+from array import array
+import struct
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Palette file header: magic, format version, reserved, number of colors
+MAGIC = b"PSLC"
+FORMAT_VERSION = 1
+_HEADER = "<4sHHL"
+
+# The number of palette entries read at a time by the streaming importers
+_BUFFER_ENTRIES = 64
+
+
+def save(self, path):
+    """Write the colors and transparency of the primary class palette to a palette
+    file that can be restored with ``PaletteSlice.load(path)``. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.save(path)``.
+
+    param str path: The path of the palette file."""
+    # pylint: disable=protected-access
+    colors = self._colors
+    if colors.itemsize != 4:
+        colors = array("I", colors)
+    with open(path, "wb") as file:
+        file.write(struct.pack(_HEADER, MAGIC, FORMAT_VERSION, 0, len(colors)))
+        file.write(colors)
+        file.write(self._alpha)
+
+
+def load(cls, path, **kwargs):
+    """Returns a new PaletteSlice object with the colors and transparency of a
+    palette file. The colors and the transparency bitmask are each read with a
+    single readinto call into preallocated storage. Raises ValueError if the file
+    is not a palette file.
+
+    param class cls: The PaletteSlice class.
+    param str path: The path of the palette file.
+    param kwargs: The in_place, capacity, cache_size, and pool parameters of the new
+    PaletteSlice object."""
+    with open(path, "rb") as file:
+        colors, alpha = _read_binary(file)
+    return _new(cls, colors, alpha, kwargs)
+
+
+def from_file(cls, path, **kwargs):
+    """Returns a new PaletteSlice object with the palette of a BMP image, a GIMP
+    (.gpl), Adobe (.act), or JASC (.pal) palette file, or a palette file written
+    by ``PaletteSlice.save()``. The format is found from the file contents; Adobe
+    files, which have no identifying header, are found by the .act file name
+    extension. Only the palette data is read. Raises ValueError if the format is
+    not recognized.
+
+    param class cls: The PaletteSlice class.
+    param str path: The path of the image or palette file.
+    param kwargs: The in_place, capacity, cache_size, and pool parameters of the new
+    PaletteSlice object."""
+    with open(path, "rb") as file:
+        magic = file.read(4)
+        file.seek(0)
+        if magic == MAGIC:
+            colors, alpha = _read_binary(file)
+        elif magic[:2] == b"BM":
+            colors, alpha = _read_bmp(file)
+        elif magic == b"GIMP":
+            colors, alpha = _read_gpl(file)
+        elif magic == b"JASC":
+            colors, alpha = _read_jasc(file)
+        elif path.lower().endswith(".act"):
+            colors, alpha = _read_act(file)
+        else:
+            raise ValueError("unknown palette file format")
+    return _new(cls, colors, alpha, kwargs)
+
+
+def _new(cls, colors, alpha, kwargs):
+    """Returns a new PaletteSlice object with reference storage of an array of
+    colors and a transparency bitmask. The capacity defaults to the number of
+    colors."""
+    kwargs.setdefault("capacity", len(colors))
+    palette_slice = cls(**kwargs)
+    # pylint: disable=protected-access
+    palette_slice._colors = colors
+    palette_slice._alpha = alpha
+    palette_slice._changed(0, len(colors))
+    return palette_slice
+
+
+def _read_binary(file):
+    """Returns the colors and transparency bitmask of a palette file written by
+    ``PaletteSlice.save()``."""
+    header = file.read(struct.calcsize(_HEADER))
+    if len(header) != struct.calcsize(_HEADER):
+        raise ValueError("not a PaletteSlice palette file")
+    magic, version, _, count = struct.unpack(_HEADER, header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a PaletteSlice palette file")
+
+    colors = array("L", (0 for _ in range(count)))
+    if colors.itemsize == 4:
+        _read_exactly(file, colors, 4 * count)
+    else:
+        # The storage word is wider than the file word
+        words = array("I", (0 for _ in range(count)))
+        _read_exactly(file, words, 4 * count)
+        colors = array("L", words)
+    alpha = bytearray((count + 7) >> 3)
+    _read_exactly(file, alpha, len(alpha))
+    return colors, alpha
+
+
+def _read_bmp(file):
+    """Returns the colors and transparency bitmask of the color table of a BMP
+    image. The pixel data is not read."""
+    header = file.read(18)
+    if len(header) != 18 or header[:2] != b"BM":
+        raise ValueError("not a BMP image")
+    pixel_offset, dib_size = struct.unpack_from("<LL", header, 10)
+    if dib_size == 12:
+        # OS/2 core header: 16-bit dimensions and 3-byte BGR entries
+        dib = file.read(8)
+        bits = struct.unpack_from("<H", dib, 6)[0]
+        count = 1 << bits if bits <= 8 else 0
+        entry_size = 3
+        table_offset = 14 + dib_size
+    else:
+        # Windows info header and later versions: 4-byte BGRX entries
+        dib = file.read(32)
+        bits, compression = struct.unpack_from("<HL", dib, 10)
+        used = struct.unpack_from("<L", dib, 28)[0]
+        count = used or (1 << bits if bits <= 8 else 0)
+        entry_size = 4
+        table_offset = 14 + dib_size
+        if dib_size == 40 and compression in (3, 6):
+            # Bit field masks follow a version 1 info header
+            table_offset += 12 if compression == 3 else 16
+    count = max(0, min(count, (pixel_offset - table_offset) // entry_size))
+
+    file.seek(table_offset)
+    colors = array("L", (0 for _ in range(count)))
+    _read_entries(file, colors, entry_size, True)
+    return colors, bytearray((count + 7) >> 3)
+
+
+def _read_act(file):
+    """Returns the colors and transparency bitmask of an Adobe color table file:
+    256 RGB entries optionally followed by the 16-bit big-endian number of colors
+    and transparent color index."""
+    colors = array("L", (0 for _ in range(256)))
+    _read_entries(file, colors, 3, False)
+    trailer = file.read(4)
+    transparent = None
+    if len(trailer) == 4:
+        count, transparent = struct.unpack(">HH", trailer)
+        if 0 < count < 256:
+            colors = colors[:count]
+    alpha = bytearray((len(colors) + 7) >> 3)
+    if transparent is not None and transparent < len(colors):
+        alpha[transparent >> 3] |= 1 << (transparent & 7)
+    return colors, alpha
+
+
+def _read_gpl(file):
+    """Returns the colors and transparency bitmask of a GIMP palette file. Header,
+    comment, and blank lines are skipped."""
+    colors = array("L")
+    file.readline()
+    for line in file:
+        fields = line.split()
+        if not fields or fields[0][:1] == b"#":
+            continue
+        try:
+            color = int(fields[0]) << 16 | int(fields[1]) << 8 | int(fields[2])
+        except (ValueError, IndexError):
+            # A Name: or Columns: header line
+            continue
+        colors.append(color)
+    return colors, bytearray((len(colors) + 7) >> 3)
+
+
+def _read_jasc(file):
+    """Returns the colors and transparency bitmask of a JASC (Paint Shop Pro)
+    palette file."""
+    file.readline()
+    file.readline()
+    count = int(file.readline())
+    colors = array("L", (0 for _ in range(count)))
+    for position in range(count):
+        fields = file.readline().split()
+        if len(fields) < 3:
+            raise ValueError("palette file is truncated")
+        colors[position] = int(fields[0]) << 16 | int(fields[1]) << 8 | int(fields[2])
+    return colors, bytearray((count + 7) >> 3)
+
+
+def _read_entries(file, colors, entry_size, bgr):
+    """Read palette entries of entry_size bytes into an array of colors through a
+    fixed buffer. Entries are RGB ordered, or BGR ordered if bgr is True. Raises
+    ValueError if the file ends first."""
+    buffer = bytearray(_BUFFER_ENTRIES * entry_size)
+    red, blue = (2, 0) if bgr else (0, 2)
+    position = 0
+    while position < len(colors):
+        size = min(len(buffer), (len(colors) - position) * entry_size)
+        _read_exactly(file, memoryview(buffer)[:size], size)
+        for offset in range(0, size, entry_size):
+            colors[position] = (
+                buffer[offset + red] << 16
+                | buffer[offset + 1] << 8
+                | buffer[offset + blue]
+            )
+            position += 1
+
+
+def _read_exactly(file, buffer, size):
+    """Read size bytes from a file into a buffer. Raises ValueError if the file
+    ends first."""
+    if size and file.readinto(buffer) != size:
+        raise ValueError("palette file is truncated")
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"save": save}
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettelut`
+================================================================================
+Per-channel lookup table transforms for PaletteSlice palettes, such as
+brightness, gamma, and white-balance correction. Transforms are applied to a
+copy of the untransformed colors, so repeated adjustments do not accumulate
+rounding errors and can be undone.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+from array import array
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def brightness_lut(brightness, gamma=1.0):
+    """Returns a 256-entry lookup table that scales a channel by brightness after
+    applying gamma correction.
+    Usage is ``brightness_lut(brightness, gamma)``.
+
+    param float brightness: The channel scale from 0.0 to 1.0.
+    param float gamma: The correction exponent; 1.0 leaves the channel linear.
+    Defaults to 1.0."""
+    return bytes(
+        min(255, int(((value / 255) ** gamma) * brightness * 255 + 0.5))
+        for value in range(256)
+    )
+
+
+def apply_lut(self, r_lut=None, g_lut=None, b_lut=None, key=None):
+    """Transform the colors of a slice of the primary class palette through
+    256-entry per-channel lookup tables in a single pass. Tables are applied to the
+    colors as they were before the first transform, which are kept until the
+    palette colors are otherwise modified; transparency changes do not discard
+    them. A new transform replaces the previous one instead of compounding it. A
+    table of None leaves the channel unchanged, so
+    ``apply_lut()`` restores the untransformed colors. Transparency is unchanged.
+    Installed as a PaletteSlice method.
+    Usage is ``PaletteSlice.apply_lut(r_lut, g_lut, b_lut, key)``.
+
+    param bytes r_lut: The red channel lookup table. Defaults to None.
+    param bytes g_lut: The green channel lookup table. Defaults to None.
+    param bytes b_lut: The blue channel lookup table. Defaults to None.
+    param slice key: The slice object of the primary class palette to transform.
+    Defaults to None, the whole palette."""
+    # pylint: disable=protected-access
+    if self._lut_original is None or self._lut_original[0] != self._color_version:
+        # The colors changed since the last transform; keep the current colors
+        original = array("L", self._colors)
+    else:
+        original = self._lut_original[1]
+
+    positions = range(*self._bounds(slice(None) if key is None else key))
+    if positions:
+        self._unshare()
+        colors = self._colors
+        for position in positions:
+            color = original[position]
+            red = color >> 16 & 0xFF
+            green = color >> 8 & 0xFF
+            blue = color & 0xFF
+            colors[position] = (
+                (red if r_lut is None else r_lut[red]) << 16
+                | (green if g_lut is None else g_lut[green]) << 8
+                | (blue if b_lut is None else b_lut[blue])
+            )
+        self._changed(min(positions), max(positions) + 1)
+    self._lut_original = (self._color_version, original)
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"apply_lut": apply_lut}
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettenearest`
+================================================================================
+PaletteNearest quantizes arbitrary RGB888 colors to the index of the closest
+PaletteSlice palette entry. Lookups use a reduced-precision RGB cube whose cells
+are filled on first use and updated incrementally as the palette changes.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+from array import array
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Cube cell value of a cell that has not been filled
+_UNSET = 0xFFFF
+
+
+class PaletteNearest:
+    """A nearest-color index for quantizing RGB888 colors to PaletteSlice palette
+    indices."""
+
+    def __init__(self, palette_slice, bits=4, skip_transparent=False):
+        """Instantiate the nearest-color index. The index is a cube of
+        2 ** (3 * bits) cells. Each cell holds the palette index nearest to the
+        center of the cell, measured as the squared distance in RGB space. Colors
+        are matched to the cell that contains them, so the result is the nearest
+        palette color within the precision of the cube.
+
+        param PaletteSlice palette_slice: The source PaletteSlice object.
+        param int bits: The number of bits per color channel used to address the
+        cube, from 1 to 6. Defaults to 4 (4096 cells).
+        param bool skip_transparent: Do not match transparent palette entries.
+        Defaults to False."""
+        if not 1 <= bits <= 6:
+            raise ValueError("bits must be from 1 to 6")
+        self._palette_slice = palette_slice
+        self._bits = bits
+        self._skip_transparent = skip_transparent
+        self._cube = array("H", (_UNSET for _ in range(1 << (3 * bits))))
+        self._version = None
+        self._colors = array("L")
+        self._alpha = bytearray()
+        self._sync()
+
+    def index(self, color):
+        """Returns the palette index of the entry nearest to an RGB888 color.
+        Usage is ``PaletteNearest.index(color)``.
+
+        param int color: The RGB888 color to match."""
+        if self._palette_slice.version != self._version:
+            self._sync()
+        return self._lookup(color)
+
+    def indices(self, colors, out=None):
+        """Returns the palette indices of the entries nearest to a sequence of
+        RGB888 colors.
+        Usage is ``PaletteNearest.indices(colors)``.
+
+        param Union(list, array, narray) colors: The RGB888 colors to match.
+        param Union(array, bytearray) out: An optional preallocated sequence to
+        receive the indices. Defaults to None, a new array.array is returned."""
+        if self._palette_slice.version != self._version:
+            self._sync()
+        if out is None:
+            out = array("H", (0 for _ in range(len(colors))))
+        for idx, color in enumerate(colors):
+            out[idx] = self._lookup(int(color))
+        return out
+
+    def _lookup(self, color):
+        """Returns the palette index stored in the cube cell containing color,
+        filling the cell if needed."""
+        shift = 8 - self._bits
+        cell = (
+            ((color >> 16 & 0xFF) >> shift) << (2 * self._bits)
+            | ((color >> 8 & 0xFF) >> shift) << self._bits
+            | (color & 0xFF) >> shift
+        )
+        nearest = self._cube[cell]
+        if nearest == _UNSET:
+            nearest = self._scan(cell)
+            self._cube[cell] = nearest
+        return nearest
+
+    def _distance(self, cell, color):
+        """Returns the squared RGB distance between the center of a cube cell and
+        a color."""
+        shift = 8 - self._bits
+        mask = (1 << self._bits) - 1
+        half = (1 << shift) >> 1
+        red = ((cell >> (2 * self._bits)) << shift | half) - (color >> 16 & 0xFF)
+        green = ((cell >> self._bits & mask) << shift | half) - (color >> 8 & 0xFF)
+        blue = ((cell & mask) << shift | half) - (color & 0xFF)
+        return red * red + green * green + blue * blue
+
+    def _candidate(self, position):
+        """Returns True if the palette entry at position may be matched."""
+        return not (self._skip_transparent and self._alpha[position])
+
+    def _scan(self, cell):
+        """Returns the index of the palette entry nearest to the center of a cube
+        cell. The lowest index wins a tie."""
+        nearest = None
+        best = None
+        for position, color in enumerate(self._colors):
+            if not self._candidate(position):
+                continue
+            distance = self._distance(cell, color)
+            if best is None or distance < best:
+                nearest, best = position, distance
+        if nearest is None:
+            raise ValueError("no palette colors to match")
+        return nearest
+
+    def _sync(self):
+        """Bring the copy of the palette and the filled cube cells up to date with
+        the PaletteSlice contents. Changed entries are updated incrementally; the
+        cube is emptied if the palette length changed or many entries changed."""
+        # Read the packed reference storage directly
+        colors = self._palette_slice._colors  # pylint: disable=protected-access
+        alpha = self._palette_slice._alpha  # pylint: disable=protected-access
+        self._version = self._palette_slice.version
+        if len(colors) != len(self._colors):
+            self._colors = array("L", colors)
+            self._alpha = bytearray(
+                alpha[position >> 3] >> (position & 7) & 1
+                for position in range(len(colors))
+            )
+            self._clear()
+            return
+
+        changed = []
+        for position, color in enumerate(colors):
+            transparent = alpha[position >> 3] >> (position & 7) & 1
+            if color != self._colors[position] or transparent != self._alpha[position]:
+                self._colors[position] = color
+                self._alpha[position] = transparent
+                changed.append(position)
+        if len(changed) * 4 > len(self._colors):
+            self._clear()
+        elif changed:
+            self._update(changed)
+
+    def _update(self, changed):
+        """Update the filled cube cells after the palette entries at the changed
+        positions changed. Cells that held a changed entry are emptied first, so
+        the remaining cells are compared with the color of an unchanged entry;
+        cells that are now nearer to a changed entry take its index."""
+        changed_set = set(changed)
+        for cell, nearest in enumerate(self._cube):
+            if nearest in changed_set:
+                self._cube[cell] = _UNSET
+        candidates = [position for position in changed if self._candidate(position)]
+        if not candidates:
+            return
+        for cell, nearest in enumerate(self._cube):
+            if nearest == _UNSET:
+                continue
+            best = self._distance(cell, self._colors[nearest])
+            for position in candidates:
+                distance = self._distance(cell, self._colors[position])
+                if distance < best or (distance == best and position < nearest):
+                    nearest, best = position, distance
+            self._cube[cell] = nearest
+
+    def _clear(self):
+        """Empty all cube cells."""
+        for cell, nearest in enumerate(self._cube):
+            if nearest != _UNSET:
+                self._cube[cell] = _UNSET
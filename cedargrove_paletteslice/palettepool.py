@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettepool`
+================================================================================
+PalettePool keeps released displayio.Palette objects for reuse by size so that
+repeated PaletteSlice slicing, such as switching slices every frame, reuses
+palettes instead of leaving a stream of garbage palettes for the collector.
+Also provides the PaletteSlice release method, which is loaded when first used.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+import displayio
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+class PalettePool:
+    """A pool of reusable displayio.Palette objects kept by size."""
+
+    def __init__(self, cap=8):
+        """Instantiate the pool. Palettes are only returned to the pool by an
+        explicit release.
+
+        param int cap: The maximum number of palettes kept in the pool. Released
+        palettes beyond the cap are left to the garbage collector. Defaults to 8."""
+        self._cap = cap
+        self._free = {}
+        self._count = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def hits(self):
+        """The number of palettes drawn from the pool."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """The number of palettes allocated because none of the size was pooled."""
+        return self._misses
+
+    @property
+    def hit_rate(self):
+        """The fraction of acquired palettes drawn from the pool, from 0.0 to 1.0."""
+        if not self._hits + self._misses:
+            return 0.0
+        return self._hits / (self._hits + self._misses)
+
+    def acquire(self, size):
+        """Returns a palette with size entries from the pool, or a new palette if
+        none of that size is pooled. The colors and transparency of a reused
+        palette are those it had when released.
+        Usage is ``PalettePool.acquire(size)``.
+
+        param int size: The number of palette entries."""
+        palettes = self._free.get(size)
+        if palettes:
+            self._count -= 1
+            self._hits += 1
+            return palettes.pop()
+        self._misses += 1
+        return displayio.Palette(size)
+
+    def release(self, palette):
+        """Return a palette to the pool for reuse. The palette must no longer be used
+        or displayed. Returns True if the palette was pooled or False if the pool
+        is full.
+        Usage is ``PalettePool.release(palette)``.
+
+        param displayio.Palette palette: The palette to return."""
+        palettes = self._free.get(len(palette))
+        if palettes is None:
+            palettes = self._free[len(palette)] = []
+        for pooled in palettes:
+            if pooled is palette:
+                # Already released
+                return True
+        if self._count >= self._cap:
+            return False
+        palettes.append(palette)
+        self._count += 1
+        return True
+
+    def clear(self):
+        """Discard the pooled palettes and reset the hit and miss counts.
+        Usage is ``PalettePool.clear()``."""
+        self._free = {}
+        self._count = 0
+        self._hits = 0
+        self._misses = 0
+
+
+def _release(self, palette):
+    """Return a palette created by slicing to the palette pool for reuse. The
+    palette must no longer be used or displayed. It is removed from the slice
+    cache; if it is the class palette, a new class palette is created when next
+    needed. Has no effect without a pool. Installed as the PaletteSlice release
+    method.
+    Usage is ``PaletteSlice.release(palette)``.
+
+    param displayio.Palette palette: The palette to return to the pool."""
+    # pylint: disable=protected-access
+    if self._pool is None:
+        return
+    if palette is self._new_palette:
+        if self._in_place:
+            raise ValueError("the in-place class palette cannot be released")
+        self._new_palette = None
+        self._dirty = (0, len(self._colors))
+    self._slice_cache = [
+        entry for entry in self._slice_cache if entry[1] is not palette
+    ]
+    self._pool.release(palette)
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"release": _release}
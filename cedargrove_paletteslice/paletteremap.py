@@ -0,0 +1,165 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteremap`
+================================================================================
+Index remapping for bitmaps that use a sliced, reordered, or compacted
+PaletteSlice palette. A lookup table maps each old palette index to its new
+index and is applied to a displayio.Bitmap in one bulk pass.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Optional: ulab (CircuitPython) or NumPy (CPython) for vectorized remapping
+
+"""
+
+from array import array
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None  # pylint: disable=invalid-name
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def slice_table(length, key):
+    """Returns the old-to-new index lookup table implied by slicing a palette of
+    length entries with a slice object. Entries in the slice map to their position
+    in the sliced palette. Entries left out of the slice map to the nearest entry
+    in the slice; a tie goes to the lower index.
+
+    param int length: The number of entries in the palette before slicing.
+    param slice key: The slice object applied to the palette."""
+    positions = range(*key.indices(length))
+    if not positions:
+        raise ValueError("slice contains no palette entries")
+    table = _new_table(length, len(positions))
+
+    # Mark the new index of every entry in the slice
+    kept = array("l", (-1 for _ in range(length)))
+    for new, old in enumerate(positions):
+        kept[old] = new
+
+    # Sweep up and down to find the distance to the nearest kept entry
+    nearest = -1
+    below = array("l", (-1 for _ in range(length)))
+    for old in range(length):
+        if kept[old] >= 0:
+            nearest = old
+        below[old] = nearest
+    nearest = -1
+    for old in range(length - 1, -1, -1):
+        if kept[old] >= 0:
+            nearest = old
+        if below[old] < 0 or (0 <= nearest and nearest - old < old - below[old]):
+            table[old] = kept[nearest]
+        else:
+            table[old] = kept[below[old]]
+    return table
+
+
+def inverse_table(order):
+    """Returns the old-to-new index lookup table of a reordered palette.
+
+    param list order: The old index of each entry in the reordered palette; the
+    new palette entry at index i was the entry at index order[i]."""
+    table = _new_table(len(order), len(order))
+    for new, old in enumerate(order):
+        table[old] = new
+    return table
+
+
+def remap_bitmap(bitmap, table):
+    """Replace every pixel value of a bitmap with its entry in an old-to-new index
+    lookup table in one bulk pass. Pixel values beyond the end of the table are
+    not changed. 8-bit and 16-bit bitmaps are remapped through the buffer protocol
+    with ulab or NumPy when available and providing take() and where(); other
+    bitmaps are remapped pixel by pixel.
+
+    param displayio.Bitmap bitmap: The bitmap to remap.
+    param Union(bytearray, array) table: The old-to-new index lookup table."""
+    bits = getattr(bitmap, "bits_per_value", 0)
+    if (
+        np is not None
+        and bits in (8, 16)
+        and hasattr(np, "take")
+        and hasattr(np, "where")
+    ):
+        try:
+            values = np.frombuffer(bitmap, dtype=np.uint8 if bits == 8 else np.uint16)
+        except (TypeError, ValueError):
+            values = None
+        if values is not None:
+            _remap_values(values, table, 1 << bits if bits == 8 else len(table))
+            if hasattr(bitmap, "dirty"):
+                # Inform displayio of the changes made through the buffer
+                bitmap.dirty()
+            return
+
+    for idx in range(bitmap.width * bitmap.height):
+        value = bitmap[idx]
+        if value < len(table) and table[value] != value:
+            bitmap[idx] = table[value]
+
+
+def bitmap_histogram(bitmap, length):
+    """Returns an array of the number of pixels of a bitmap with each value from 0
+    to length - 1, counted in one pass. Pixel values of length or more are not
+    counted. 8-bit and 16-bit bitmaps without row padding are counted through the
+    buffer protocol with NumPy when available; other bitmaps are counted pixel by
+    pixel.
+
+    param displayio.Bitmap bitmap: The bitmap to count.
+    param int length: The number of palette entries to count."""
+    counts = array("L", (0 for _ in range(length)))
+    bits = getattr(bitmap, "bits_per_value", 0)
+    if np is not None and bits in (8, 16) and hasattr(np, "bincount"):
+        try:
+            values = np.frombuffer(bitmap, dtype=np.uint8 if bits == 8 else np.uint16)
+        except (TypeError, ValueError):
+            values = None
+        if values is not None and len(values) == bitmap.width * bitmap.height:
+            for value, count in enumerate(np.bincount(values)[:length]):
+                counts[value] = int(count)
+            return counts
+
+    for idx in range(bitmap.width * bitmap.height):
+        value = bitmap[idx]
+        if value < length:
+            counts[value] += 1
+    return counts
+
+
+def _new_table(length, count):
+    """Returns a zeroed lookup table with length entries that can hold indices
+    up to count."""
+    if count <= 256:
+        return bytearray(length)
+    return array("H", (0 for _ in range(length)))
+
+
+def _remap_values(values, table, size):
+    """Replace the values of a ulab or NumPy narray with their entries in a lookup
+    table extended with unchanged values up to size entries. Values of size or
+    more are not changed."""
+    lookup = np.array(
+        [table[idx] if idx < len(table) else idx for idx in range(size)],
+        dtype=values.dtype,
+    )
+    remapped = np.take(lookup, values, mode="clip")
+    if size < 1 << (8 * values.itemsize):
+        # Clipped lookups of values beyond the lookup table keep their value
+        remapped = np.where(values < size, remapped, values)
+    values[:] = remapped
@@ -5,7 +5,12 @@
 ================================================================================
 PaletteSlice is a CircuitPython wrapper class to add list slice capability to a
 displayio.Palette object while preserving transparency values. Creates a sliced
-displayio.Palette object.
+displayio.Palette object. The core holds the packed reference storage and
+slicing; everything else is an extension loaded from its module when first used:
+the list operations (append, count, extend, insert, pop, index, remove, reverse,
+sort, min, max, all, any, compact), fill_gradient, apply_lut, rotate_hue,
+scale_saturation, sync_to, view, save, set_colors, release, the instrumentation,
+the slice cache, and in-place palette patching.
 
 * Author(s): JG
 
@@ -19,123 +24,441 @@ Implementation Notes
 
 """
 
+from array import array
+import time
 import displayio
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
 
+# Extension methods by name and the module that provides them; an extension
+# module is imported and its methods are added to the class on first use
+_EXTENSIONS = {
+    "append": "paletteslice_listops",
+    "count": "paletteslice_listops",
+    "extend": "paletteslice_listops",
+    "index": "paletteslice_listops",
+    "insert": "paletteslice_listops",
+    "pop": "paletteslice_listops",
+    "remove": "paletteslice_listops",
+    "reverse": "paletteslice_listops",
+    "sort": "paletteslice_listops",
+    "min": "paletteslice_listops",
+    "max": "paletteslice_listops",
+    "all": "paletteslice_listops",
+    "any": "paletteslice_listops",
+    "compact": "paletteslice_listops",
+    "fill_gradient": "palettegradient",
+    "apply_lut": "palettelut",
+    "rotate_hue": "palettehsv",
+    "scale_saturation": "palettehsv",
+    "sync_to": "palettesync",
+    "view": "paletteview",
+    "save": "paletteio",
+    "set_colors": "palettebuffer",
+    "enable_stats": "palettestats",
+    "disable_stats": "palettestats",
+    "stats": "palettestats",
+    "release": "palettepool",
+    "capacity": "paletteinplace",
+    "_patch_palette": "paletteinplace",
+    "_cached_slice": "palettecache",
+    "_reserve": "paletteassign",
+    "_set_sequence": "paletteassign",
+    "_splice": "paletteassign",
+}
 
-# pylint: disable = duplicate-code
+
+# pylint: disable = too-many-instance-attributes
 class PaletteSlice:
     """A CircuitPython wrapper class to add list slice capability to a displayio.Palette
     object while preserving transparency values."""
 
-    def __init__(self, source_palette):
-        """Instantiate the palette slice class. Creates a reference list and a
-        displayio.Palette object with source palette color values.
+    # Buffer color formats; the value is the number of bytes per color
+    RGB565 = 2
+    RGB = 3
+    RGB888 = 4
+
+    def __init__(
+        self,
+        source_palette=None,
+        in_place=False,
+        capacity=None,
+        cache_size=2,
+        pool=None,
+    ):
+        """Instantiate the palette slice class. Creates the packed reference storage
+        and a displayio.Palette object with source palette color values.
         Transparency is preserved.
 
-        param displayio.Palette source_palette: The source displayio.Palette object."""
-        self._source_palette = source_palette
+        When in_place is True, the class palette object is kept for the life of the
+        instance and modifications are patched into it entry by entry. Slices are
+        returned as new palettes without replacing the class palette. The class
+        palette reserves room for capacity entries; unused entries are transparent.
+        The class palette is only reallocated when the reserved capacity is exceeded.
 
-        # Create a clean new_palette
-        self._new_palette = displayio.Palette(len(self._source_palette))
+        The most recently used slices are kept in a cache of up to cache_size
+        palettes. Repeating a slice of unchanged contents returns the cached palette
+        without allocating a new one; cached palettes are shared and should not be
+        modified directly. Any modification of the reference storage empties the cache.
 
-        # Create reference_list and new_palette copy using the source color and transparency
-        self._reference_list = []
+        When a PalettePool is given, new palettes are drawn from the pool and
+        palettes no longer in use can be returned to it with release().
 
-        for idx, color in enumerate(self._source_palette):
-            # Create reference_list with color and transparency
-            self._reference_list.append(
-                (color, self._source_palette.is_transparent(idx))
-            )
-            # Add color to new_palette
-            self._new_palette[idx] = color
-            # Set new_palette color index transparency
+        param displayio.Palette source_palette: The source displayio.Palette object.
+        Defaults to None, an empty palette.
+        param bool in_place: Patch the class palette in place. Defaults to False.
+        param int capacity: The number of entries to reserve in the class palette
+        when in_place is True. Defaults to None, the length of the source palette.
+        param int cache_size: The maximum number of cached slice palettes. Defaults
+        to 2. A value of 0 disables the cache.
+        param PalettePool pool: The pool of reusable palettes. Defaults to None, no
+        pool."""
+        self._source_palette = source_palette
+        self._in_place = in_place
+
+        # Create packed reference storage: a 32-bit word per color and a
+        # transparency bitmask with one bit per color
+        self._colors = array("L", source_palette if source_palette is not None else ())
+        self._alpha = bytearray((len(self._colors) + 7) >> 3)
+        for idx in range(len(self._colors)):
             if self._source_palette.is_transparent(idx):
-                self._new_palette.make_transparent(idx)
+                self._alpha[idx >> 3] |= 1 << (idx & 7)
+
+        # The list of color-transparency tuples is only built when requested
+        self._reference_list = None
+
+        # The color index of the list operations maps each color to its storage
+        # position or to a sorted list of positions. It is built on first use and
+        # then kept up to date using a copy of the indexed colors.
+        self._color_index = None
+        self._indexed_colors = None
+
+        # Set when views share the reference storage; the storage is copied
+        # before it is next modified
+        self._shared = False
+
+        # The (color version, colors) of the palette before the first lookup
+        # table transform; kept while the colors are only modified by transforms
+        self._lut_original = None
+
+        # The hue, saturation and value decomposition of the palette before the
+        # first hue or saturation transform and the transform settings
+        self._hsv = None
+
+        # The version is incremented when the reference storage is modified; the
+        # color version only when colors are modified, not transparency alone
+        self._version = 0
+        self._color_version = 0
+
+        # Palette updates are deferred until the palette is needed, or while a
+        # batch is open when patched in place; the (start, stop) storage
+        # positions waiting to be updated are kept in dirty
+        self._batch_depth = 0
+        self._dirty = None
+
+        # Most recently used first list of (bounds, palette) slice cache entries
+        self._cache_size = cache_size
+        self._slice_cache = []
+        self._cache_version = 0
+        self._pool = pool
+
+        # Instrumentation counters and callback; None while disabled
+        self._stats = None
+        self._stats_callback = None
+
+        # Create new_palette copy using the source color and transparency; unless
+        # patched in place, it is created when first needed
+        self._new_palette = None
+        if in_place:
+            self._new_palette = self._create_palette(range(len(self._colors)), capacity)
+        else:
+            self._dirty = (0, len(self._colors))
 
     def __getitem__(self, key):
-        """Returns a new_palette slice from reference_list.
+        """Returns a new_palette slice from the reference storage. The slice becomes
+        the class palette unless the class palette is patched in place.
 
         param slice key: The slice object specifying the new palette."""
-        # Move reference_list slice into working_list
-        working_list = self._reference_list[key]
-        self._create_new_palette(working_list)
-        return self._new_palette
+        started = self._stats and time.monotonic_ns()
+        bounds = self._bounds(key)
+        if self._cache_size:
+            new_palette = self._cached_slice(bounds)
+        else:
+            new_palette = self._slice(bounds)
+        if not self._in_place:
+            # The slice replaces any class palette update that is waiting
+            self._new_palette = new_palette
+            self._dirty = None
+        if started:
+            self._add_time("__getitem__", started)
+        return new_palette
 
     def __setitem__(self, key, value):
         """Replace or add new color palette, list, or narray to a sliced new_palette.
+        Each element of the value is one color. Typed arrays and narrays with items
+        of 32 bits or more are copied directly into the reference storage as RGB888
+        colors using ``set_colors()``; RGB565 and packed RGB buffers are copied
+        with ``set_colors()`` and an explicit color format.
 
         param slice key: The target slice object for creating new_palette.
         param Union(displayio.Palette, list, narray) value: The palette of new colors."""
+        started = self._stats and time.monotonic_ns()
+        if getattr(value, "itemsize", 0) >= 4:
+            # value is a typed buffer of RGB888 colors
+            self.set_colors(key, value, self.RGB888)
+        else:
+            self._set_sequence(key, value)
+        if started:
+            self._add_time("__setitem__", started)
+
+    def __getattr__(self, name):
+        """Load the extension module of an extension method on first use."""
+        if name not in _EXTENSIONS:
+            raise AttributeError(f"'PaletteSlice' object has no attribute '{name}'")
+        self.load_extensions(_EXTENSIONS[name])
+        if not hasattr(PaletteSlice, name):
+            raise AttributeError(f"extension method '{name}' was not loaded")
+        if self._stats is not None:
+            # Time the methods of the newly loaded extension module
+            self._time_methods(_EXTENSIONS[name], _EXTENSIONS)
+        return getattr(self, name)
+
+    def __contains__(self, color):
+        """Determine if the reference storage contains the singleton color. Returns True
+        or False.
+        Usage is ``color in PaletteSlice.palette``.
+
+        param int color: The color to find."""
+        if self._color_index is not None:
+            return self.count(color) > 0
+        return color in self._colors
+
+    def __enter__(self):
+        self._batch_depth += 1
+        return self
 
-        # Extract color and transparency from new_color palette and create working_list
-        working_list = []
-        list_flag = isinstance(value[0], (float, int))
-        for idx, color in enumerate(value):
-            if list_flag:
-                # value is an array or list
-                working_list.append((int(color), False))
-            else:
-                # value is likely a palette
-                working_list.append((color, value.is_transparent(idx)))
-
-        # Move working_list into the specified reference_list slice
-        self._reference_list[key] = working_list
-        self._create_new_palette(self._reference_list)
+    def __exit__(self, exception_type, exception_value, traceback):
+        self._batch_depth -= 1
+        if self._in_place:
+            self._flush()
 
     def __len__(self):
+        if self._in_place or self._dirty is not None:
+            # A waiting update would rebuild the class palette from the whole
+            # reference storage; count it without building it
+            return len(self._colors)
         return len(self._new_palette)
 
     @property
     def palette(self):
-        """The primary class palette (an adjusted displayio.Palette object)."""
+        """The primary class palette (an adjusted displayio.Palette object). When
+        patched in place, the palette length is the reserved capacity. Unless
+        patched in place, changes made since the palette was last requested are
+        applied when it is requested."""
+        self._flush()
         return self._new_palette
 
+    @property
+    def version(self):
+        """The modification counter of the reference storage. Incremented each time
+        the palette contents are changed."""
+        return self._version
+
     @property
     def reference_list(self):
-        """A list of color-transparency tuples from the primary class palette."""
+        """A list of color-transparency tuples from the primary class palette. The
+        list is built from the packed reference storage when first requested after a
+        change and is a read-only view; use the class methods to modify the palette."""
+        if self._reference_list is None:
+            self._reference_list = [
+                (color, self._transparent(idx))
+                for idx, color in enumerate(self._colors)
+            ]
         return self._reference_list
 
+    def batch(self):
+        """Returns a context manager that defers class palette updates. The changes
+        made within the block are applied to the reference storage immediately, but
+        the class palette is updated only once: when the block exits if patched in
+        place, otherwise when the palette is next requested. Within the block the
+        class palette is not updated by changes, while slices and the other methods
+        see the changed contents. Blocks may be nested; the update is made after
+        the outermost block exits.
+        Usage is ``with PaletteSlice.batch():``."""
+        return self
+
+    @classmethod
+    def load_extensions(cls, *modules):
+        """Add the methods of extension modules to the class. Extension methods are
+        otherwise loaded when first used; loading them at startup keeps the import
+        from fragmenting the heap later. Usage is ``PaletteSlice.load_extensions()``.
+
+        param str modules: The names of the extension modules to load, such as
+        "paletteslice_listops". Defaults to all extension modules."""
+        for module_name in modules or sorted(set(_EXTENSIONS.values())):
+            module = __import__(
+                "cedargrove_paletteslice." + module_name, None, None, ["METHODS"]
+            )
+            for name, method in module.METHODS.items():
+                setattr(cls, name, method)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Returns a new PaletteSlice object with the colors and transparency of a
+        palette file written by ``PaletteSlice.save()``. The packed colors and the
+        transparency bitmask are read directly into the reference storage.
+        Usage is ``PaletteSlice.load(path)``.
+
+        param str path: The path of the palette file.
+        param kwargs: The in_place, capacity, and cache_size parameters of the new
+        PaletteSlice object."""
+        # pylint: disable=import-outside-toplevel
+        from cedargrove_paletteslice.paletteio import load
+
+        return load(cls, path, **kwargs)
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """Returns a new PaletteSlice object with the palette of a BMP image, a GIMP
+        (.gpl), Adobe (.act), or JASC (.pal) palette file, or a palette file
+        written by ``PaletteSlice.save()``. Only the palette data is read; BMP
+        pixel data is not decoded.
+        Usage is ``PaletteSlice.from_file(path)``.
+
+        param str path: The path of the image or palette file.
+        param kwargs: The in_place, capacity, and cache_size parameters of the new
+        PaletteSlice object."""
+        # pylint: disable=import-outside-toplevel
+        from cedargrove_paletteslice.paletteio import from_file
+
+        return from_file(cls, path, **kwargs)
+
     def is_transparent(self, index):
         """Returns True if the palette index is transparent. Returns False if opaque.
         Usage is ``PaletteSlice.is_transparent(index)``.
 
         param int index: The palette color index to test."""
-        return self._reference_list[index][1]
+        return self._transparent(self._position(index))
 
     def make_transparent(self, index):
-        """Set a palette index to transparency. Permanently modifies reference_list
-        and new_palette.
+        """Set a palette index to transparency. Permanently modifies the reference
+        storage and new_palette.
         Usage is ``PaletteSlice.make_opaque(index)``.
 
         param int index: The palette color index to be made transparent."""
-        self._reference_list[index] = (self._reference_list[index][0], True)
-        self._create_new_palette(self._reference_list)
+        position = self._position(index)
+        self._set_transparent(position, True)
+        self._changed(position, position + 1, False)
 
     def make_opaque(self, index):
-        """Set a palette index to opaque. Permanently modifies reference_list
+        """Set a palette index to opaque. Permanently modifies the reference storage
         and new_palette.
         Usage is ``PaletteSlice.make_opaque(index)``.
 
         param int index: The palette color index to be made opaque."""
-        self._reference_list[index] = (self._reference_list[index][0], False)
-        self._create_new_palette(self._reference_list)
-
-    def _create_new_palette(self, source_list):
-        """Create new_palette from a source list composed of color-transparency tuples."""
-        if isinstance(source_list, tuple):
-            self._new_palette = displayio.Palette(1)
-            self._new_palette[0] = source_list[0]
-            if source_list[1]:
-                self._new_palette.make_transparent(0)
+        position = self._position(index)
+        self._set_transparent(position, False)
+        self._changed(position, position + 1, False)
+
+    def _position(self, index):
+        """Returns the non-negative reference storage position of an integer index.
+        Raises IndexError if the index is out of range."""
+        return range(len(self._colors))[index]
+
+    def _bounds(self, key):
+        """Returns the reference storage (start, stop, step) of a slice object or of
+        an integer index."""
+        if isinstance(key, slice):
+            return key.indices(len(self._colors))
+        position = self._position(key)
+        return position, position + 1, 1
+
+    def _transparent(self, position):
+        """Returns True if the transparency bit of a storage position is set."""
+        return bool(self._alpha[position >> 3] & (1 << (position & 7)))
+
+    def _set_transparent(self, position, transparent):
+        """Set or clear the transparency bit of a storage position."""
+        self._unshare()
+        if transparent:
+            self._alpha[position >> 3] |= 1 << (position & 7)
+        else:
+            self._alpha[position >> 3] &= ~(1 << (position & 7))
+
+    def _unshare(self):
+        """Copy the reference storage before it is modified if views share it."""
+        if self._shared:
+            self._colors = array("L", self._colors)
+            self._alpha = bytearray(self._alpha)
+            self._shared = False
+
+    def _changed(self, start, stop, colors=True):
+        """Discard views of the reference storage and update new_palette after the
+        reference storage positions from start to stop were modified. Positions
+        beyond the end of the reference storage are no longer in use. Unless the
+        palette is patched in place, the update is deferred until the palette is
+        needed; when patched in place, it is deferred while a batch is open. The
+        colors flag is False when only transparency was modified."""
+        self._reference_list = None
+        self._version += 1
+        if colors:
+            self._color_version += 1
+        if self._color_index is not None:
+            self._update_index(start, stop)
+        if self._batch_depth or not self._in_place:
+            if self._dirty is not None:
+                start = min(start, self._dirty[0])
+                stop = max(stop, self._dirty[1])
+            self._dirty = (start, stop)
+            return
+        self._update_palette(start, stop)
+
+    def _flush(self):
+        """Apply the waiting new_palette update unless a batch is open and there is
+        a class palette."""
+        if self._dirty is not None and (
+            not self._batch_depth or self._new_palette is None
+        ):
+            start, stop = self._dirty
+            self._dirty = None
+            self._update_palette(start, stop)
+
+    def _update_palette(self, start, stop):
+        """Update new_palette after the reference storage positions from start to
+        stop were modified."""
+        if self._in_place:
+            self._patch_palette(start, stop)
+            return
+        self._new_palette = self._create_palette(range(len(self._colors)))
+        if self._stats is not None:
+            self._record("rebuild", len(self._colors))
+
+    def _slice(self, bounds):
+        """Returns a new palette of a (start, stop, step) storage bounds tuple."""
+        new_palette = self._create_palette(range(*bounds))
+        if self._stats is not None:
+            self._record("slice", len(new_palette))
+        return new_palette
+
+    def _create_palette(self, positions, capacity=None):
+        """Create a displayio.Palette from a range of reference storage positions.
+        The palette is padded with transparent entries up to capacity."""
+        size = max(len(positions), capacity or 0)
+        if self._pool is None:
+            new_palette = displayio.Palette(size)
         else:
-            self._new_palette = displayio.Palette(len(source_list))
-            # Add contents to new_palette using sliced source_list color and transparency
-            for idx, (color, transparency) in enumerate(source_list):
-                # Add color to new_palette
-                self._new_palette[idx] = color
-                if transparency:
-                    # Set new_palette color index transparency
-                    self._new_palette.make_transparent(idx)
+            new_palette = self._pool.acquire(size)
+        # Add contents to new_palette using the sliced reference color and transparency
+        for idx, position in enumerate(positions):
+            # Add color to new_palette
+            new_palette[idx] = self._colors[position]
+            if self._alpha[position >> 3] & (1 << (position & 7)):
+                # Set new_palette color index transparency
+                new_palette.make_transparent(idx)
+            elif self._pool is not None:
+                # A pooled palette keeps the transparency it was released with
+                new_palette.make_opaque(idx)
+        for idx in range(len(positions), len(new_palette)):
+            new_palette.make_transparent(idx)
+        return new_palette
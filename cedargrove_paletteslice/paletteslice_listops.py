@@ -0,0 +1,451 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_listops`
+================================================================================
+List operations for PaletteSlice: append, count, extend, insert, pop, index,
+remove, reverse, sort, min, max, all, any, and compact, with the color index used to
+find colors. The functions in this module are
+installed as PaletteSlice methods when one of them is first used, so
+applications that only slice palettes do not load them.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+* Optional: ulab (CircuitPython) or NumPy (CPython) for vectorized sort keys
+
+"""
+
+from array import array
+
+try:
+    from ulab import numpy as np
+except ImportError:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None  # pylint: disable=invalid-name
+
+# The functions are installed as methods of the PaletteSlice class
+# pylint: disable=protected-access
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Named sort keys
+LUMINANCE = "luminance"
+HUE = "hue"
+
+
+def append(self, color):
+    """Append a color value to the primary class palette.
+    Permanently modifies the reference storage and palette.
+    Usage is ``PaletteSlice.append(color)``.
+
+    param int color: The color value to be added to the end of
+    the primary class palette."""
+    end = len(self._colors)
+    self._changed(*self._splice(end, end, array("L", (color,)), b"\x00"))
+
+
+def count(self, color):
+    """Counts the occurrences of the color value in the primary class palette.
+    Usage is ``PaletteSlice.count(color)``.
+
+    param int color: The color value to count."""
+    positions = self._index().get(color)
+    if positions is None:
+        return 0
+    if isinstance(positions, int):
+        return 1
+    return len(positions)
+
+
+def extend(self, add_list):
+    """UNTESTED:
+    Append a list of color-transparency tuples to the primary class
+    palette. Permanently modifies the reference storage and palette.
+    Usage is ``PaletteSlice.extend(add_list)``.
+
+    param list add_list: The list of color-transparency tuples to be added to the
+    end of the primary class palette."""
+    colors = array("L")
+    transparency = bytearray(len(add_list))
+    for idx, (color, transparent) in enumerate(add_list):
+        colors.append(color)
+        transparency[idx] = transparent
+    end = len(self._colors)
+    self._changed(*self._splice(end, end, colors, transparency))
+
+
+def insert(self, key, color):
+    """Insert an opaque color value into the primary class palette at
+    slice object key. Permanently modifies the reference storage and palette.
+    Usage is ``PaletteSlice.insert(key, color)``.
+
+    param slice key: The target slice object to insert into the updated color palette.
+    param int color: The opaque color value to be inserted into
+    the primary class palette."""
+    # Clamp the insertion point the same way as list.insert()
+    position = slice(key, key).indices(len(self._colors))[0]
+    self._changed(*self._splice(position, position, array("L", (color,)), b"\x00"))
+
+
+def pop(self, key):
+    """Remove a color-transparency entry from the primary class palette at
+    slice object key. Permanently modifies the reference storage and palette.
+    Returns the removed color value.
+    Usage is ``PaletteSlice.pop(key)``.
+
+    param slice key: The target slice object to remove from the primary class palette."""
+    position = self._position(key)
+    color = self._colors[position]
+    self._changed(*self._splice(position, position + 1, array("L"), b""))
+    return color
+
+
+def index(self, color, start=None, stop=None):
+    """Returns the smallest index where the color matches the element value or
+    None if not found. start and stop optionally specify the starting and
+    ending index for the search; like a list, stop is not included.
+    Usage is ``PaletteSlice.index(color)``.
+
+    param integer color: The color value for the search.
+    param integer start: The starting index value. Defaults to None, the start
+    of the palette.
+    param integer stop: The ending index value. Defaults to None, the end of the
+    palette."""
+    positions = self._index().get(color)
+    if positions is None:
+        return None
+    start, stop, _ = slice(start, stop).indices(len(self._colors))
+    if isinstance(positions, int):
+        positions = (positions,)
+
+    # Binary search for the first position at or after start
+    low, high = 0, len(positions)
+    while low < high:
+        middle = (low + high) >> 1
+        if positions[middle] < start:
+            low = middle + 1
+        else:
+            high = middle
+    if low < len(positions) and positions[low] < stop:
+        return positions[low]
+    return None
+
+
+def remove(self, color):
+    """Remove the first occurrence of a color value from the primary class palette.
+    Permanently modifies the reference storage and palette. Raises ValueError if
+    the color is not found.
+    Usage is ``PaletteSlice.remove(color)``.
+
+    param int color: The color value to remove."""
+    position = self.index(color)
+    if position is None:
+        raise ValueError("PaletteSlice.remove(color): color not in palette")
+    self._changed(*self._splice(position, position + 1, array("L"), b""))
+
+
+def reverse(self):
+    """Reverse the order of the primary class palette entries. Permanently modifies
+    the reference storage and palette. Returns the order of the reversed palette:
+    the new entry at index i was the entry at index order[i], as used by
+    ``paletteremap.inverse_table(order)``.
+    Usage is ``PaletteSlice.reverse()``."""
+    return self._reorder(range(len(self._colors) - 1, -1, -1))
+
+
+def sort(self, key=None, reverse=False):  # pylint: disable=redefined-outer-name
+    """Sort the primary class palette entries in place. Entries with equal keys
+    keep their order. Transparency moves with each color. Permanently modifies the
+    reference storage and palette. Returns the order of the sorted palette: the
+    new entry at index i was the entry at index order[i], as used by
+    ``paletteremap.inverse_table(order)``.
+    Usage is ``PaletteSlice.sort(key, reverse)``.
+
+    param Union(str, function) key: None to sort by color value, "luminance" or
+    "hue" (``paletteslice_listops.LUMINANCE``, ``paletteslice_listops.HUE``), or a
+    function of one color value. Keys are computed once per entry; named keys are
+    computed with ulab or NumPy when available. Grays sort before all hues.
+    Defaults to None.
+    param bool reverse: Sort in descending order. Defaults to False."""
+    keys = _sort_keys(self._colors, key)
+    if reverse:
+        # Descending keys; the negated position keeps equal keys in order
+        decorated = sorted(
+            ((sort_key, -position) for position, sort_key in enumerate(keys)),
+            reverse=True,
+        )
+        return self._reorder([-position for _, position in decorated])
+    decorated = sorted(zip(keys, range(len(keys))))
+    return self._reorder([position for _, position in decorated])
+
+
+def _min(self, key=None):
+    """Returns the color value with the smallest value or key in the primary class
+    palette. The first entry wins a tie. Raises ValueError if the palette is empty.
+    Usage is ``PaletteSlice.min(key)``.
+
+    param Union(str, function) key: The sort key; see ``PaletteSlice.sort()``.
+    Defaults to None, the color value."""
+    return self._colors[_extreme(self._colors, key, False)]
+
+
+def _max(self, key=None):
+    """Returns the color value with the largest value or key in the primary class
+    palette. The first entry wins a tie. Raises ValueError if the palette is empty.
+    Usage is ``PaletteSlice.max(key)``.
+
+    param Union(str, function) key: The sort key; see ``PaletteSlice.sort()``.
+    Defaults to None, the color value."""
+    return self._colors[_extreme(self._colors, key, True)]
+
+
+def _all(self, predicate=None):
+    """Returns True if the predicate is true for every color value in the primary
+    class palette, or if no predicate is given and every color is non-zero (not
+    black). Returns True if the palette is empty.
+    Usage is ``PaletteSlice.all(predicate)``.
+
+    param function predicate: A function of one color value. Defaults to None."""
+    for color in self._colors:
+        if not (predicate(color) if predicate else color):
+            return False
+    return True
+
+
+def _any(self, predicate=None):
+    """Returns True if the predicate is true for any color value in the primary
+    class palette, or if no predicate is given and any color is non-zero (not
+    black). Returns False if the palette is empty.
+    Usage is ``PaletteSlice.any(predicate)``.
+
+    param function predicate: A function of one color value. Defaults to None."""
+    for color in self._colors:
+        if predicate(color) if predicate else color:
+            return True
+    return False
+
+
+def compact(self, bitmap=None):
+    """Merge palette entries with identical color and transparency into the first
+    of each, and optionally drop the entries that a bitmap does not use. The kept
+    entries keep their order. Permanently modifies the reference storage and
+    palette. Returns the compacted class palette and the old-to-new index lookup
+    table, as used by ``paletteremap.remap_bitmap(bitmap, table)``. Dropped
+    entries map to index 0.
+    Usage is ``PaletteSlice.compact(bitmap)``.
+
+    param displayio.Bitmap bitmap: A bitmap drawn with the palette. Entries whose
+    index is not used by any pixel of the bitmap are dropped. Defaults to None,
+    only duplicates are merged."""
+    length = len(self._colors)
+    counts = None
+    if bitmap is not None:
+        # pylint: disable=import-outside-toplevel
+        from cedargrove_paletteslice.paletteremap import bitmap_histogram
+
+        counts = bitmap_histogram(bitmap, length)
+
+    if length <= 256:
+        table = bytearray(length)
+    else:
+        table = array("H", (0 for _ in range(length)))
+    kept = {}
+    order = []
+    for position, color in enumerate(self._colors):
+        if counts is not None and not counts[position]:
+            continue
+        entry = color << 1 | self._transparent(position)
+        new = kept.get(entry)
+        if new is None:
+            new = kept[entry] = len(order)
+            order.append(position)
+        table[position] = new
+    if len(order) != length:
+        self._reorder(order)
+    elif not self._in_place and self._dirty is None:
+        # The class palette may be the last slice read; rebuild it from the
+        # whole reference storage
+        self._dirty = (0, length)
+    return self.palette, table
+
+
+def _index(self):
+    """Returns the color index, building it from the reference storage if needed."""
+    if self._color_index is None:
+        self._color_index = {}
+        self._indexed_colors = array("L", self._colors)
+        for position, color in enumerate(self._colors):
+            self._index_add(color, position)
+    return self._color_index
+
+
+def _index_add(self, color, position):
+    """Add a storage position to the color index entry of a color."""
+    positions = self._color_index.get(color)
+    if positions is None:
+        self._color_index[color] = position
+    elif isinstance(positions, int):
+        self._color_index[color] = sorted((positions, position))
+    else:
+        # Keep the list of positions sorted
+        idx = len(positions)
+        while idx and positions[idx - 1] > position:
+            idx -= 1
+        positions.insert(idx, position)
+
+
+def _index_remove(self, color, position):
+    """Remove a storage position from the color index entry of a color."""
+    positions = self._color_index[color]
+    if isinstance(positions, int):
+        del self._color_index[color]
+    else:
+        positions.remove(position)
+        if len(positions) == 1:
+            self._color_index[color] = positions[0]
+
+
+def _update_index(self, start, stop):
+    """Update the color index after the reference storage positions from start to
+    stop were modified. The index is discarded and rebuilt when next needed if
+    existing entries moved to new positions."""
+    indexed = self._indexed_colors
+    length = len(self._colors)
+    if length != len(indexed):
+        if start != len(indexed) or length < len(indexed):
+            self._color_index = None
+            self._indexed_colors = None
+            return
+        # Entries were added to the end
+        for position in range(start, length):
+            indexed.append(self._colors[position])
+            self._index_add(self._colors[position], position)
+        return
+    for position in range(start, stop):
+        color = self._colors[position]
+        if indexed[position] != color:
+            self._index_remove(indexed[position], position)
+            self._index_add(color, position)
+            indexed[position] = color
+
+
+def _reorder(self, order):
+    """Replace the reference storage entries with the entries at the positions of
+    order, where the new entry at position i is the entry at position order[i].
+    Entries not in order are removed. Returns the order as an array."""
+    colors = array("L", (self._colors[position] for position in order))
+    transparency = bytearray(self._transparent(position) for position in order)
+    self._changed(*self._splice(0, len(self._colors), colors, transparency))
+    return array("H" if len(colors) <= 0x10000 else "L", order)
+
+
+def _sort_keys(colors, key):
+    """Returns a list of the sort key of each color in an array of colors."""
+    if key is None:
+        return list(colors)
+    if callable(key):
+        return [key(color) for color in colors]
+    if key not in (LUMINANCE, HUE):
+        raise ValueError(f"unknown sort key: {key}")
+    if np is not None and len(colors) > 1:
+        return _vector_keys(colors, key)
+    if key == LUMINANCE:
+        return [_luminance(color) for color in colors]
+    return [_hue(color) for color in colors]
+
+
+def _extreme(colors, key, largest):
+    """Returns the position of the first color with the smallest or largest key."""
+    if not colors:
+        raise ValueError("empty palette")
+    keys = _sort_keys(colors, key)
+    best = 0
+    for position in range(1, len(keys)):
+        if keys[position] > keys[best] if largest else keys[position] < keys[best]:
+            best = position
+    return best
+
+
+def _luminance(color):
+    """Returns the integer Rec. 601 luma of a color, scaled by 1000."""
+    return 299 * (color >> 16 & 0xFF) + 587 * (color >> 8 & 0xFF) + 114 * (color & 0xFF)
+
+
+def _hue(color):
+    """Returns the hue of a color in degrees from 0.0 to less than 360.0, or -1
+    for a gray."""
+    red, green, blue = color >> 16 & 0xFF, color >> 8 & 0xFF, color & 0xFF
+    high = max(red, green, blue)
+    delta = high - min(red, green, blue)
+    if not delta:
+        return -1
+    if high == red:
+        hue = (green - blue) / delta
+        if hue < 0:
+            hue += 6
+    elif high == green:
+        hue = (blue - red) / delta + 2
+    else:
+        hue = (red - green) / delta + 4
+    return hue * 60
+
+
+def _vector_keys(colors, key):
+    """Returns a list of the luminance or hue sort key of each color in an array of
+    colors computed with ulab or NumPy. Channels are read from the little-endian
+    bytes of the array."""
+    stride = colors.itemsize
+    channels = np.frombuffer(colors, dtype=np.uint8)
+    red = channels[2::stride] * 1.0
+    green = channels[1::stride] * 1.0
+    blue = channels[0::stride] * 1.0
+    if key == LUMINANCE:
+        return [int(luma) for luma in 299 * red + 587 * green + 114 * blue]
+
+    high = np.maximum(np.maximum(red, green), blue)
+    delta = high - np.minimum(np.minimum(red, green), blue)
+    divisor = np.where(delta == 0, 1.0, delta)
+    red_hue = (green - blue) / divisor
+    red_hue = np.where(red_hue < 0, red_hue + 6, red_hue)
+    hue = np.where(
+        high == red,
+        red_hue,
+        np.where(
+            high == green, (blue - red) / divisor + 2, (red - green) / divisor + 4
+        ),
+    )
+    return [float(value) for value in np.where(delta == 0, -1.0, hue * 60)]
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {
+    "append": append,
+    "count": count,
+    "extend": extend,
+    "insert": insert,
+    "pop": pop,
+    "index": index,
+    "remove": remove,
+    "reverse": reverse,
+    "sort": sort,
+    "min": _min,
+    "max": _max,
+    "all": _all,
+    "any": _any,
+    "compact": compact,
+    "_index": _index,
+    "_index_add": _index_add,
+    "_index_remove": _index_remove,
+    "_update_index": _update_index,
+    "_reorder": _reorder,
+}
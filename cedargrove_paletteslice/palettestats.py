@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettestats`
+================================================================================
+Optional instrumentation for PaletteSlice: counters of palette rebuilds,
+allocations, copied entries and slice cache hits, and the number of calls and
+cumulative time of each public method. Loaded when instrumentation is first
+used.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+import time
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+# Public methods that are not timed by the instrumentation
+_UNTIMED = ("batch", "enable_stats", "disable_stats", "stats", "load_extensions")
+
+
+def enable_stats(self, callback=None):
+    """Start counting palette rebuilds, palette allocations, entries copied into
+    palettes, slice cache hits and misses, and the number of calls and cumulative
+    time of each public method. All counters start at zero. The optional callback
+    function is called as ``callback(event, stats)`` each time a palette is
+    allocated, where event is "rebuild" for the class palette or "slice" for a
+    sliced palette. Instrumentation is disabled by default; while disabled it
+    costs one attribute test on the palette update path. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.enable_stats(callback)``.
+
+    param function callback: The function called when a palette is allocated.
+    Defaults to None."""
+    # pylint: disable=protected-access
+    disable_stats(self)
+    self._stats = {
+        "rebuilds": 0,
+        "allocations": 0,
+        "copied": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "time": {},
+    }
+    self._stats_callback = callback
+    for name in _timed_names(self):
+        setattr(self, name, _timer(self, name, getattr(self, name)))
+
+
+def disable_stats(self):
+    """Stop the instrumentation and discard the counters. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.disable_stats()``."""
+    # pylint: disable=protected-access
+    if self._stats is None:
+        return
+    for name in _timed_names(self):
+        try:
+            delattr(self, name)
+        except AttributeError:
+            # An extension method loaded after instrumentation was enabled
+            pass
+    self._stats = None
+    self._stats_callback = None
+
+
+def stats(self):
+    """Returns a snapshot dictionary of the instrumentation counters or None if
+    instrumentation is disabled. The "time" entry maps the name of each public
+    method called to a (calls, microseconds) tuple. Installed as a PaletteSlice
+    method.
+    Usage is ``PaletteSlice.stats()``."""
+    # pylint: disable=protected-access
+    if self._stats is None:
+        return None
+    snapshot = dict(self._stats)
+    snapshot["time"] = {
+        name: (calls, elapsed // 1000)
+        for name, (calls, elapsed) in self._stats["time"].items()
+    }
+    return snapshot
+
+
+def _time_methods(self, module_name, extensions):
+    """Time the methods of an extension module loaded while instrumentation is
+    enabled."""
+    for name in _timed_names(self):
+        if extensions.get(name) == module_name:
+            setattr(self, name, _timer(self, name, getattr(self, name)))
+
+
+def _timed_names(self):
+    """Returns a list of the names of the public methods that are timed."""
+    return [
+        name
+        for name in dir(type(self))
+        if name[0] != "_"
+        and name not in _UNTIMED
+        and callable(getattr(type(self), name))
+    ]
+
+
+def _timer(self, name, method):
+    """Returns a function that calls a bound method and adds the call and the time
+    spent to the instrumentation counters."""
+
+    def timed(*args, **kwargs):
+        started = time.monotonic_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _add_time(self, name, started)
+
+    return timed
+
+
+def _add_time(self, name, started):
+    """Add a call of a public method that started at a monotonic_ns time to the
+    instrumentation counters."""
+    # pylint: disable=protected-access
+    if self._stats is None:
+        return
+    entry = self._stats["time"].get(name)
+    if entry is None:
+        entry = self._stats["time"][name] = [0, 0]
+    entry[0] += 1
+    entry[1] += time.monotonic_ns() - started
+
+
+def _record(self, event, copied=0):
+    """Count a palette event and the entries copied, and call the instrumentation
+    callback when a palette is allocated. Events are "rebuild" and "slice" for
+    allocated palettes, "patch" for entries patched in place, and "hit" for a
+    slice cache hit."""
+    # pylint: disable=protected-access
+    counters = self._stats
+    counters["copied"] += copied
+    if event == "hit":
+        counters["cache_hits"] += 1
+        return
+    if event == "patch":
+        return
+    counters["allocations"] += 1
+    if event == "rebuild":
+        counters["rebuilds"] += 1
+    else:
+        counters["cache_misses"] += 1
+    if self._stats_callback is not None:
+        self._stats_callback(event, counters)
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {
+    "enable_stats": enable_stats,
+    "disable_stats": disable_stats,
+    "stats": stats,
+    "_time_methods": _time_methods,
+    "_add_time": _add_time,
+    "_record": _record,
+}
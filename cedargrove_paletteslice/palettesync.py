@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`palettesync`
+================================================================================
+Differential update of a live displayio.Palette from a PaletteSlice object.
+Only the entries whose color or transparency differ are written, so the palette
+shown by a TileGrid keeps its identity and the changed index ranges can be used
+to refresh only the affected parts of the display.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+def sync_to(self, target_palette, key=None):
+    """Update an existing displayio.Palette to match a slice of the primary class
+    palette, writing only the entries whose color or transparency changed.
+    Target entries beyond the end of the slice are made transparent; slice
+    entries beyond the end of the target are not copied. Returns a list of
+    (start, stop) target index ranges that were changed. Installed as a
+    PaletteSlice method.
+    Usage is ``PaletteSlice.sync_to(target_palette, key)``.
+
+    param displayio.Palette target_palette: The live palette to update.
+    param slice key: The slice object of the primary class palette to copy.
+    Defaults to None, the whole palette."""
+    # pylint: disable=protected-access
+    positions = range(*self._bounds(slice(None) if key is None else key))
+    colors = self._colors
+    alpha = self._alpha
+    length = len(target_palette)
+    ranges = []
+    for idx in range(length):
+        if idx < len(positions):
+            position = positions[idx]
+            color = colors[position]
+            transparent = bool(alpha[position >> 3] & (1 << (position & 7)))
+            if target_palette[idx] != color:
+                target_palette[idx] = color
+            elif target_palette.is_transparent(idx) == transparent:
+                continue
+        else:
+            transparent = True
+            if target_palette.is_transparent(idx):
+                continue
+        if transparent:
+            target_palette.make_transparent(idx)
+        else:
+            target_palette.make_opaque(idx)
+
+        # Extend the last changed range or start a new one
+        if ranges and ranges[-1][1] == idx:
+            ranges[-1] = (ranges[-1][0], idx + 1)
+        else:
+            ranges.append((idx, idx + 1))
+    return ranges
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"sync_to": sync_to}
@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteview`
+================================================================================
+PaletteView is a lightweight read-only slice of a PaletteSlice palette. A view
+shares the packed reference storage of its PaletteSlice and translates indices
+when read; a displayio.Palette is only created when the view's palette property
+is used. When the PaletteSlice is next modified it copies its storage first
+(copy-on-write), so a view keeps the contents it had when it was taken.
+
+* Author(s): JG
+
+Implementation Notes
+--------------------
+**Hardware:**
+
+**Software and Dependencies:**
+* Adafruit CircuitPython firmware for the supported boards:
+  https://circuitpython.org/downloads
+
+"""
+
+import displayio
+
+__version__ = "0.0.0+auto.0"
+__repo__ = "https://github.com/CedarGroveStudios/CircuitPython_PaletteSlice.git"
+
+
+class PaletteView:
+    """A read-only slice view of PaletteSlice reference storage."""
+
+    def __init__(self, colors, alpha, positions):
+        """Instantiate the view. Views are created with ``PaletteSlice.view(key)``.
+
+        param array colors: The shared packed color storage.
+        param bytearray alpha: The shared transparency bitmask.
+        param range positions: The storage positions of the view entries."""
+        self._colors = colors
+        self._alpha = alpha
+        self._positions = positions
+        self._palette = None
+
+    def __getitem__(self, key):
+        """Returns the color value of a view index, or a view of a slice of the view.
+
+        param Union(int, slice) key: The view index or slice object."""
+        if isinstance(key, slice):
+            return PaletteView(self._colors, self._alpha, self._positions[key])
+        return self._colors[self._positions[key]]
+
+    def __len__(self):
+        return len(self._positions)
+
+    @property
+    def palette(self):
+        """A displayio.Palette with the view colors and transparency, created when
+        first requested. The view contents do not change, so the same palette is
+        returned each time; it should not be modified directly."""
+        if self._palette is None:
+            self._palette = displayio.Palette(len(self._positions))
+            for idx, position in enumerate(self._positions):
+                self._palette[idx] = self._colors[position]
+                if self._alpha[position >> 3] & (1 << (position & 7)):
+                    self._palette.make_transparent(idx)
+        return self._palette
+
+    def is_transparent(self, index):
+        """Returns True if the view index is transparent. Returns False if opaque.
+        Usage is ``PaletteView.is_transparent(index)``.
+
+        param int index: The view color index to test."""
+        position = self._positions[index]
+        return bool(self._alpha[position >> 3] & (1 << (position & 7)))
+
+
+def view(self, key):
+    """Returns a PaletteView of a slice of the primary class palette. The view
+    shares the reference storage instead of copying it and keeps the contents the
+    slice had when the view was taken. Unlike slicing, the class palette is not
+    replaced. Installed as a PaletteSlice method.
+    Usage is ``PaletteSlice.view(key)``.
+
+    param slice key: The slice object specifying the view."""
+    # pylint: disable=protected-access
+    positions = range(*self._bounds(key))
+    self._shared = True
+    return PaletteView(self._colors, self._alpha, positions)
+
+
+# The functions installed as PaletteSlice methods, by method name
+METHODS = {"view": view}
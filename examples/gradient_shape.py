@@ -15,7 +15,7 @@ import board
 # from adafruit_display_shapes.line import Line
 from adafruit_display_shapes.circle import Circle
 import displayio
-from cedargrove_rgb_spectrumtools.n_color import Spectrum
+from cedargrove_paletteslice.paletteslice_acme import PaletteSlice
 
 OBJ_WIDTH = 35
 OBJ_HEIGHT = 25
@@ -29,23 +29,20 @@ display.brightness = 0.005
 primary_group = displayio.Group()
 display.root_group = primary_group
 
-# Create Red/Yellow/Green light-style spectrum
-spectrum_1 = Spectrum([0xFF0000, 0xFFFF00, 0x00FF00], mode="continuous", gamma=0.6)
-gradient_palette_1 = displayio.Palette(OBJ_WIDTH)
-for i in range(0, OBJ_WIDTH):
-    gradient_palette_1[i] = spectrum_1.color(index=i / OBJ_WIDTH)
-
-# Create a second spectrum
-spectrum_2 = Spectrum([0xFF00FF, 0x00FF00, 0xF0FFF0], mode="continuous", gamma=0.6)
-gradient_palette_2 = displayio.Palette(OBJ_WIDTH)
-for i in range(0, OBJ_WIDTH):
-    gradient_palette_2[i] = spectrum_2.color(index=i / OBJ_WIDTH)
-
-# Create a third spectrum
-spectrum_3 = Spectrum([0xFF00FF, 0xFF0000], mode="continuous", gamma=0.6)
-gradient_palette_3 = displayio.Palette(OBJ_WIDTH)
-for i in range(0, OBJ_WIDTH):
-    gradient_palette_3[i] = spectrum_3.color(index=i / OBJ_WIDTH)
+# Create Red/Yellow/Green light-style gradient
+gradient_1 = PaletteSlice(displayio.Palette(OBJ_WIDTH))
+gradient_1.fill_gradient(slice(None), [0xFF0000, 0xFFFF00, 0x00FF00], gamma=0.6)
+gradient_palette_1 = gradient_1.palette
+
+# Create a second gradient
+gradient_2 = PaletteSlice(displayio.Palette(OBJ_WIDTH))
+gradient_2.fill_gradient(slice(None), [0xFF00FF, 0x00FF00, 0xF0FFF0], gamma=0.6)
+gradient_palette_2 = gradient_2.palette
+
+# Create a third gradient
+gradient_3 = PaletteSlice(displayio.Palette(OBJ_WIDTH))
+gradient_3.fill_gradient(slice(None), [0xFF00FF, 0xFF0000], gamma=0.6)
+gradient_palette_3 = gradient_3.palette
 
 for i in range(OBJ_WIDTH, -1, -1):
     """gradient_object = Rectangle(
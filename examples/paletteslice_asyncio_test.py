@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_asyncio_test`
+================================================================================
+A test of the PaletteAnimator asyncio scheduler. Two hue shifts animate the
+test image while a second task keeps running alongside them.
+
+* Author(s): JG
+"""
+
+import gc
+import asyncio
+import board
+import displayio
+import adafruit_imageload
+from cedargrove_paletteslice.paletteslice import PaletteSlice
+from cedargrove_paletteslice.paletteanimator import PaletteAnimator
+
+BKG_IMAGE_FILE = "orchid.bmp"
+FRAMES_PER_SECOND = 20
+
+# Define the display and primary display group
+display = board.DISPLAY
+display.brightness = 0.1
+primary_group = displayio.Group()
+
+# Load the test image and source color palette
+test_bitmap, test_palette_source = adafruit_imageload.load(
+    BKG_IMAGE_FILE, bitmap=displayio.Bitmap, palette=displayio.Palette
+)
+
+# Instantiate a sliceable copy of the reference palette and its displayed palette
+pal_sliceable = PaletteSlice(test_palette_source)
+live_palette = pal_sliceable[:]
+
+# Place the test image into a tile and append to the primary display group
+test_tile = displayio.TileGrid(test_bitmap, pixel_shader=live_palette)
+primary_group.append(test_tile)
+
+# Display the primary group
+display.root_group = primary_group
+
+
+def hue_shift(frame):
+    """Rotate the hues of the lower half of the palette by 3 degrees a frame."""
+    pal_sliceable.rotate_hue(frame * 3 % 360, slice(0, 128))
+
+
+def hue_shift_back(frame):
+    """Rotate the hues of the upper half of the palette in the other direction."""
+    pal_sliceable.rotate_hue(-frame * 3 % 360, slice(128, 256))
+
+
+animator = PaletteAnimator(fps=FRAMES_PER_SECOND, budget=0.5)
+animator.add(pal_sliceable, hue_shift, live_palette)
+animator.add(pal_sliceable, hue_shift_back, live_palette, priority=1)
+
+
+async def report():
+    """Report the animation statistics while the animations run."""
+    while True:
+        await asyncio.sleep(5)
+        # pylint: disable=no-member
+        print(
+            f"frames: {animator.frames} dropped: {animator.dropped} "
+            + f"skipped: {animator.skipped} memory free: {gc.mem_free()} bytes"
+        )
+
+
+async def main():
+    """Run the animations and the report task together."""
+    await asyncio.gather(asyncio.create_task(animator.run()), report())
+
+
+asyncio.run(main())
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_cycle_test`
+================================================================================
+A test of the PaletteCycle color-cycling engine with a PaletteSlice palette.
+
+* Author(s): JG
+"""
+
+import time
+import gc
+import board
+import displayio
+import adafruit_imageload
+from cedargrove_paletteslice.paletteslice import PaletteSlice
+from cedargrove_paletteslice.palettecycle import PaletteCycle
+
+BKG_IMAGE_FILE = "orchid.bmp"
+FRAME_DURATION = 0.05  # seconds per frame
+
+# Define the display and primary display group
+display = board.DISPLAY
+display.brightness = 0.1
+primary_group = displayio.Group()
+
+# Load the test image and source color palette
+test_bitmap, test_palette_source = adafruit_imageload.load(
+    BKG_IMAGE_FILE, bitmap=displayio.Bitmap, palette=displayio.Palette
+)
+
+# Instantiate a sliceable copy of the reference palette and the cycling engine
+pal_sliceable = PaletteSlice(test_palette_source)
+pal_cycle = PaletteCycle(pal_sliceable)
+
+# Rotate three independent ranges at different speeds and directions
+pal_cycle.add_range(0, 64, speed=1)
+pal_cycle.add_range(64, 128, speed=-0.5)
+pal_cycle.add_range(128, 256, speed=2)
+
+# Place the test image into a tile and append to the primary display group
+test_tile = displayio.TileGrid(test_bitmap, pixel_shader=pal_cycle.palette)
+primary_group.append(test_tile)
+
+# Display the primary group
+display.root_group = primary_group
+
+# pylint: disable=no-member
+print(f"memory free: {gc.mem_free()} bytes")
+
+frame = 0
+while True:
+    # Swap in the next color-cycled palette
+    test_tile.pixel_shader = pal_cycle.step()
+    time.sleep(FRAME_DURATION)
+
+    frame += 1
+    if frame % 100 == 0:
+        # Steady-state animation should not reduce free memory
+        print(f"frame: {frame} memory free: {gc.mem_free()} bytes")
@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_memory_test`
+================================================================================
+Reports the free heap used by importing the PaletteSlice core, by the first use
+of a list operation extension method, and by loading the remaining extension
+methods as ``paletteslice_acme`` does. Run after a reset for repeatable results.
+
+* Author(s): JG
+"""
+
+import gc
+import displayio
+
+# pylint: disable=no-member
+
+
+def heap_used(previous):
+    """Print and return the free heap after collecting garbage."""
+    gc.collect()
+    free = gc.mem_free()
+    if previous is not None:
+        print(f"  heap used: {previous - free} bytes")
+    return free
+
+
+free_heap = heap_used(None)
+print(f"memory free at start: {free_heap} bytes")
+
+print("import cedargrove_paletteslice.paletteslice")
+# pylint: disable=wrong-import-position
+from cedargrove_paletteslice.paletteslice import PaletteSlice
+
+free_heap = heap_used(free_heap)
+
+print("PaletteSlice(displayio.Palette(16))")
+test_palette = displayio.Palette(16)
+for i in range(16):
+    test_palette[i] = i * 0x111111
+pal_sliceable = PaletteSlice(test_palette)
+free_heap = heap_used(free_heap)
+
+print("first use of a list operation: pal_sliceable.append()")
+pal_sliceable.append(0xFFFFFF)
+free_heap = heap_used(free_heap)
+
+print("load the remaining extension methods, as paletteslice_acme does")
+PaletteSlice.load_extensions()
+free_heap = heap_used(free_heap)
+
+print(f"memory free at end: {free_heap} bytes")
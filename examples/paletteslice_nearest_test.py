@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: Copyright (c) 2022 JG for Cedar Grove Maker Studios
+# SPDX-License-Identifier: MIT
+"""
+`paletteslice_nearest_test`
+================================================================================
+A check of the incremental PaletteNearest update. After several palette entries
+change between lookups, every cube cell of the updated index must match the cell
+of a freshly built index.
+
+* Author(s): JG
+"""
+
+import displayio
+from cedargrove_paletteslice.paletteslice import PaletteSlice
+from cedargrove_paletteslice.palettenearest import PaletteNearest
+
+BITS = 5
+
+# A 16-color palette with every fourth entry transparent
+test_palette = displayio.Palette(16)
+for i in range(16):
+    test_palette[i] = (i * 0x3B1F27) & 0xFFFFFF
+    if i % 4 == 3:
+        test_palette.make_transparent(i)
+pal_sliceable = PaletteSlice(test_palette)
+
+nearest = PaletteNearest(pal_sliceable, bits=BITS, skip_transparent=True)
+
+# Fill every cube cell before the palette changes
+cells = [
+    red << (16 + 8 - BITS) | green << (8 + 8 - BITS) | blue << (8 - BITS)
+    for red in range(1 << BITS)
+    for green in range(1 << BITS)
+    for blue in range(1 << BITS)
+]
+nearest.indices(cells)
+
+# Change more than one entry between lookups
+pal_sliceable[5:6] = [0x000000]
+pal_sliceable.make_opaque(3)
+
+updated = nearest.indices(cells)
+fresh = PaletteNearest(pal_sliceable, bits=BITS, skip_transparent=True).indices(cells)
+mismatched = sum(1 for idx, index in enumerate(updated) if index != fresh[idx])
+print(f"cells: {len(cells)} mismatched: {mismatched}")
+print("PASS" if not mismatched else "FAIL")